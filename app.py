@@ -3,18 +3,47 @@ AI-Powered Development Assistant - Main Streamlit Application
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import os
+import io
 import json
 import zipfile
+from collections import Counter
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
+import shutil
+import atexit
+import hashlib
+import itertools
+import queue
+import threading
+import time
 from pathlib import Path
 import re
+import subprocess
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+# Fast JSON parsing/encoding when orjson is installed; its decode error subclasses json.JSONDecodeError
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj, indent=False) -> str:
+        """Encode obj as JSON text (compact unless indent)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj, indent=False) -> str:
+        """Encode obj as JSON text (compact unless indent)."""
+        return json.dumps(obj, indent=2) if indent else json.dumps(obj, separators=(',', ':'))
+
 # Import core modules
-from core import AIEngine, Generator, ErrorHandler, FileManager
+from core import AIEngine, Generator, ErrorHandler, FileManager, LLMCache
 from core.file_manager import DockerSandbox
 
 # Page configuration
@@ -24,210 +53,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling (blue theme)
-st.markdown("""
-<style>
-    :root {
-        --primary-700: #0d47a1;
-        --primary-600: #1565c0;
-        --primary-500: #1976d2;
-        --primary-400: #1e88e5;
-        --primary-300: #42a5f5;
-        --surface: #f5f8ff;
-        --card: #ffffff;
-        --text-900: #0f172a;
-        --text-700: #334155;
-        --text-500: #64748b;
-    }
-
-    .main-hero {
-        background: linear-gradient(135deg, var(--primary-700), var(--primary-500));
-        color: #fff;
-        padding: 24px 28px;
-        border-radius: 14px;
-        margin: 8px 0 24px 0;
-        box-shadow: 0 6px 20px rgba(13, 71, 161, 0.25);
-        text-align: center;
-    }
-    .main-hero h1 {
-        margin: 0;
-        font-size: 2.1rem;
-        font-weight: 800;
-        letter-spacing: 0.2px;
-    }
-    .main-hero p {
-        margin: 6px 0 0 0;
-        font-size: 0.98rem;
-        color: rgba(255,255,255,0.9);
-    }
-
-    .feature-card {
-        background-color: var(--card);
-        padding: 16px;
-        border-radius: 12px;
-        margin: 10px 0;
-        border: 1px solid rgba(25, 118, 210, 0.12);
-        box-shadow: 0 2px 10px rgba(0,0,0,0.04);
-    }
-    .success-box {
-        background: #eaf2ff;
-        border: 1px solid #cfe0ff;
-        border-radius: 10px;
-        padding: 14px;
-        margin: 12px 0;
-    }
-    .warning-box {
-        background: #f3f6fc;
-        border: 1px solid #e2e8f5;
-        border-radius: 10px;
-        padding: 14px;
-        margin: 12px 0;
-    }
-    .upload-area {
-        border: 2px dashed rgba(25, 118, 210, 0.35);
-        border-radius: 12px;
-        padding: 22px;
-        text-align: center;
-        background-color: #f8fbff;
-    }
-    .tech-stack-card {
-        background-color: #e3f2fd;
-        border: 1px solid #bbdefb;
-        border-radius: 10px;
-        padding: 14px;
-        margin: 10px 0;
-    }
-    body {
-        background-color: var(--surface);
-        font-family: "Inter", "Segoe UI", system-ui, -apple-system, sans-serif;
-        color: var(--text-900);
-    }
-    .stButton>button {
-        border-radius: 8px;
-        padding: 0.5rem 1rem;
-        background: linear-gradient(135deg, var(--primary-600), var(--primary-400));
-        color: #fff;
-        border: 0;
-        box-shadow: 0 4px 12px rgba(30, 136, 229, 0.35);
-    }
-    .stButton>button:hover {
-        background: linear-gradient(135deg, var(--primary-700), var(--primary-500));
-    }
-
-    /* Tabs styling */
-    div[role="tablist"] > div {
-        background: #ffffff;
-        border: 1px solid rgba(25, 118, 210, 0.12) !important;
-        color: var(--text-700) !important;
-        border-radius: 10px 10px 0 0 !important;
-        margin-right: 6px;
-        padding: 6px 10px !important;
-    }
-    div[role="tablist"] > div[aria-selected="true"] {
-        border-bottom: 3px solid var(--primary-500) !important;
-        color: var(--primary-600) !important;
-        font-weight: 700 !important;
-        background: linear-gradient(180deg, rgba(30,136,229,0.08), rgba(30,136,229,0.02));
-    }
-
-    /* Streamlit UI kit overrides to enforce blue */
-    .stRadio > label, .stCheckbox > label, .stSlider > label {
-        color: var(--text-900) !important;
-    }
-    .stRadio div[role='radiogroup'] > label[data-baseweb='radio'] svg, .stCheckbox svg {
-        fill: var(--primary-500) !important;
-        color: var(--primary-500) !important;
-    }
-    .stRadio div[role='radiogroup'] input:checked + div svg {
-        fill: var(--primary-600) !important;
-        color: var(--primary-600) !important;
-    }
-    /* Slider */
-    .stSlider [data-baseweb='slider'] div[role='slider'] {
-        background: var(--primary-500) !important;
-        border-color: var(--primary-500) !important;
-    }
-    .stSlider [data-baseweb='slider'] div[role='slider']::after {
-        background: var(--primary-600) !important;
-    }
-
-    /* Force blue accents for radios, checkboxes, sliders, toggles */
-    :root {
-        --primary-color: #1e88e5; /* Streamlit theme var */
-    }
-    input[type="radio"], input[type="checkbox"], input[type="range"] {
-        accent-color: var(--primary-500) !important;
-    }
-    /* Baseweb (used by Streamlit) specific radio/slider overrides */
-    /* Radio */
-    .stRadio [data-baseweb='radio']>div:first-child {
-        border-color: var(--primary-500) !important;
-    }
-    .stRadio [data-baseweb='radio'][aria-checked='true']>div:first-child {
-        background-color: var(--primary-500) !important;
-        border-color: var(--primary-500) !important;
-    }
-    .stRadio [data-baseweb='radio'] svg {
-        color: var(--primary-500) !important;
-        fill: var(--primary-500) !important;
-    }
-    [data-baseweb="slider"] div[role="slider"], [data-baseweb="slider"] div[role="slider"]::before {
-        background-color: var(--primary-500) !important;
-        border-color: var(--primary-500) !important;
-    }
-    [data-baseweb="slider"] div[aria-valuenow] {
-        color: var(--text-700) !important;
-    }
-    /* Slider track colors */
-    .stSlider [data-baseweb='slider']>div:first-child {
-        background-color: rgba(30,136,229,0.25) !important; /* base track */
-    }
-    .stSlider [data-baseweb='slider']>div:nth-child(2) {
-        background-color: var(--primary-500) !important; /* active track */
-    }
-    .stSlider span, .stSlider label {
-        color: var(--text-700) !important; /* numbers under slider */
-    }
-    [role="switch"], [data-baseweb="switch"] {
-        border-color: rgba(25,118,210,0.35) !important;
-    }
-    [role="switch"][aria-checked="true"], [data-baseweb="switch"] [aria-checked="true"] {
-        background-color: var(--primary-500) !important;
-        border-color: var(--primary-500) !important;
-    }
-
-    /* Tabs highlight bar (BaseWeb) */
-    .stTabs [data-baseweb='tab-highlight'] {
-        background-color: var(--primary-500) !important;
-    }
-
-    /* Badges and chips */
-    .badge {
-        display: inline-block;
-        padding: 4px 10px;
-        border-radius: 999px;
-        background: rgba(25,118,210,0.12);
-        color: #0d47a1;
-        border: 1px solid rgba(25,118,210,0.25);
-        font-size: 12px;
-        font-weight: 600;
-        margin-right: 6px;
-    }
-    .badge.ok { background: rgba(25,118,210,0.12); color: #0d47a1; border-color: rgba(25,118,210,0.25); }
-    .badge.warn { background: rgba(25,118,210,0.08); color: #0f172a; border-color: rgba(25,118,210,0.18); }
-
-    .kpi-card {
-        background: #ffffff;
-        border: 1px solid rgba(25,118,210,0.12);
-        border-radius: 12px;
-        padding: 12px 14px;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.04);
-        text-align: center;
-    }
-    .kpi-card .label { color: var(--text-500); font-size: 12px; }
-    .kpi-card .value { color: var(--primary-600); font-size: 22px; font-weight: 800; }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS (blue theme) is served from static/custom.css so browsers can cache it.
+# The link is re-emitted on every run because Streamlit drops elements a rerun doesn't produce.
+st.markdown('<link rel="stylesheet" href="app/static/custom.css">', unsafe_allow_html=True)
 
 # Initialize session state
 if 'generated_files' not in st.session_state:
@@ -248,6 +76,24 @@ if 'last_healing_result' not in st.session_state:
     st.session_state.last_healing_result = None
 if 'last_main_file_name' not in st.session_state:
     st.session_state.last_main_file_name = None
+if 'healing_task' not in st.session_state:
+    st.session_state.healing_task = None
+if 'generated_project_archive' not in st.session_state:
+    st.session_state.generated_project_archive = None
+if 'generated_files_changed' not in st.session_state:
+    st.session_state.generated_files_changed = False
+if 'last_feature_result' not in st.session_state:
+    st.session_state.last_feature_result = None
+if 'last_onboarding_doc' not in st.session_state:
+    st.session_state.last_onboarding_doc = None
+if 'requirements_test_result' not in st.session_state:
+    st.session_state.requirements_test_result = None
+
+# Root for on-disk caches (LLM responses, repository clones) that outlive the process
+APP_CACHE_DIR = Path.home() / ".codegen_tester" / "cache"
+
+# Cached LLM responses (including healing fixes) older than this are dropped at startup
+LLM_CACHE_TTL = 30 * 24 * 60 * 60
 
 # Helper to map UI model names to API model names
 def map_model_name(ui_model: str) -> str:
@@ -268,15 +114,18 @@ def initialize_components(version="v2.1"):  # Version parameter to force cache r
     error_handler = ErrorHandler()
     file_manager = FileManager()
     generator = Generator(ai_engine=ai_engine, error_handler=error_handler, file_manager=file_manager)
+    llm_cache = LLMCache(str(APP_CACHE_DIR / "llm.sqlite"))
+    llm_cache.prune(LLM_CACHE_TTL)
     
     return {
         'ai_engine': ai_engine,
         'generator': generator,
         'error_handler': error_handler,
-        'file_manager': file_manager
+        'file_manager': file_manager,
+        'llm_cache': llm_cache
     }
 
-components = initialize_components(version="v2.1")
+components = initialize_components(version="v2.2")
 
 # Helper to log errors and display them
 def handle_and_display_error(error: Exception, context: str):
@@ -284,18 +133,65 @@ def handle_and_display_error(error: Exception, context: str):
     components['error_handler'].handle_error(error, context)
     st.error(f"{context}: {str(error)}")
 
+# Oldest File Manager entries beyond this are dropped and their files removed
+GENERATED_FILES_LIMIT = 256
+
+def record_generated_files(*entries):
+    """Add File Manager entries, evicting the oldest past the limit.
+
+    An evicted entry's file is deleted only when no remaining entry points at
+    the same path (healed files are rewritten in place).
+    """
+    generated = st.session_state.generated_files
+    generated.extend(entries)
+    st.session_state.generated_files_changed = True
+    overflow = len(generated) - GENERATED_FILES_LIMIT
+    if overflow > 0:
+        evicted = generated[:overflow]
+        del generated[:overflow]
+        still_used = {file_info['path'] for file_info in generated}
+        for path in {file_info['path'] for file_info in evicted} - still_used:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def rerun_app_if_files_changed():
+    """Rerun the whole app once after files were recorded.
+
+    Tabs are fragments, so recording files only reruns the calling tab; the
+    sidebar and File Manager fragments redraw only on an app-scope rerun.
+    Call at the end of a tab, after everything worth keeping is in session_state.
+    """
+    if st.session_state.generated_files_changed:
+        st.session_state.generated_files_changed = False
+        _scan_code_dir.clear()  # the directory mtime misses writes in nested dirs
+        st.rerun()
+
 # Document processing functions
+@st.cache_resource(show_spinner=False)
+def _get_pdf_backend():
+    """Return the fastest available PDF library as (name, module), memoized."""
+    for name in ("fitz", "pypdf", "PyPDF2"):
+        try:
+            return name, __import__(name)
+        except ImportError:
+            continue
+    return None, None
+
 def extract_text_from_pdf(pdf_file):
     """Extract text from PDF file"""
     try:
-        import PyPDF2
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        backend, pdf_lib = _get_pdf_backend()
+        if backend is None:
+            raise ImportError("No PDF library available (install pymupdf, pypdf or PyPDF2)")
+        if backend == "fitz":
+            with pdf_lib.open(stream=pdf_file.read(), filetype="pdf") as doc:
+                return "\n".join(page.get_text() for page in doc)
+        pdf_reader = pdf_lib.PdfReader(pdf_file)
+        return "\n".join((page.extract_text() or "") for page in pdf_reader.pages)
     except ImportError as e:
-        handle_and_display_error(e, "extract_text_from_pdf: missing PyPDF2")
+        handle_and_display_error(e, "extract_text_from_pdf: missing PDF library")
         return None
     except Exception as e:
         handle_and_display_error(e, "extract_text_from_pdf")
@@ -306,10 +202,7 @@ def extract_text_from_docx(docx_file):
     try:
         import docx
         doc = docx.Document(docx_file)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs)
     except ImportError as e:
         handle_and_display_error(e, "extract_text_from_docx: missing python-docx")
         return None
@@ -317,76 +210,587 @@ def extract_text_from_docx(docx_file):
         handle_and_display_error(e, "extract_text_from_docx")
         return None
 
+def _decode_text_upload(uploaded_file) -> str:
+    """Decode an uploaded text file, detecting the encoding when it isn't UTF-8."""
+    raw = uploaded_file.getbuffer()  # zero-copy view of the upload
+    try:
+        return str(raw, 'utf-8')
+    except UnicodeDecodeError:
+        pass
+    try:
+        import charset_normalizer
+        match = charset_normalizer.from_bytes(bytes(raw[:4096])).best()
+        encoding = match.encoding if match else 'utf-8'
+    except ImportError:
+        encoding = 'utf-8'
+    return str(raw, encoding, errors='replace')
+
 def extract_text_from_txt(txt_file):
     """Extract text from text file"""
     try:
-        return txt_file.read().decode('utf-8')
+        return _decode_text_upload(txt_file)
     except Exception as e:
         handle_and_display_error(e, "extract_text_from_txt")
         return None
 
 def extract_text_from_md(md_file):
+    """Extract text from markdown file"""
     try:
-        return md_file.read().decode('utf-8')
+        return _decode_text_upload(md_file)
     except Exception as e:
         handle_and_display_error(e, "extract_text_from_md")
         return None
 
+# CSVs below this size are passed through as raw text
+CSV_INLINE_LIMIT = 256 * 1024
+
 def extract_text_from_csv(csv_file):
     try:
-        import pandas as pd
-        df = pd.read_csv(csv_file)
-        return df.to_string()
-    except ImportError as e:
-        handle_and_display_error(e, "extract_text_from_csv: missing pandas")
-        return None
+        # CSV is already text; small files need no pandas round trip
+        if getattr(csv_file, "size", CSV_INLINE_LIMIT) < CSV_INLINE_LIMIT:
+            return _decode_text_upload(csv_file)
+        # Large files: sample representative rows for the prompt
+        return pd.read_csv(csv_file, nrows=500).to_csv(index=False)
     except Exception as e:
         handle_and_display_error(e, "extract_text_from_csv")
         return None
 
+def _file_ext(name: str) -> str:
+    """Lower-cased extension of a file name, without the dot."""
+    return name.rpartition('.')[2].lower()
+
+# Text extractor for each supported document extension
+DOCUMENT_EXTRACTORS = {
+    'pdf': extract_text_from_pdf,
+    'docx': extract_text_from_docx,
+    'doc': extract_text_from_docx,
+    'txt': extract_text_from_txt,
+    'md': extract_text_from_md,
+    'csv': extract_text_from_csv,
+}
+
 def process_uploaded_document(uploaded_file):
     """Process uploaded document and extract text"""
     if uploaded_file is None:
         return None
     
-    file_extension = uploaded_file.name.lower().split('.')[-1]
-    
-    if file_extension == 'pdf':
-        return extract_text_from_pdf(uploaded_file)
-    elif file_extension in ['docx', 'doc']:
-        return extract_text_from_docx(uploaded_file)
-    elif file_extension == 'txt':
-        return extract_text_from_txt(uploaded_file)
-    elif file_extension == 'md':
-        return extract_text_from_md(uploaded_file)
-    elif file_extension == 'csv':
-        return extract_text_from_csv(uploaded_file)
+    file_extension = _file_ext(uploaded_file.name)
+    extractor = DOCUMENT_EXTRACTORS.get(file_extension)
+    if extractor:
+        return extractor(uploaded_file)
     else:
         handle_and_display_error(ValueError("Unsupported file. Supported types: pdf, docx, doc, txt, md, csv"), f"process_uploaded_document: {file_extension}")
         return None
 
+class _DocParseFailed(Exception):
+    """Raised out of _parse_doc_cached so a failed parse is never cached."""
+
+@st.cache_data(ttl=24 * 60 * 60, max_entries=64, show_spinner=False)
+def _parse_doc_cached(name: str, data: bytes) -> str:
+    """Extract text from an upload's bytes; identical uploads are parsed once."""
+    buffer = io.BytesIO(data)
+    buffer.name, buffer.size = name, len(data)
+    text = process_uploaded_document(buffer)
+    if text is None:
+        # The extractor has already displayed the error; raising keeps None out of the cache
+        raise _DocParseFailed(name)
+    return text
+
+def _parse_doc(name: str, data: bytes):
+    """Cached document text, or None when parsing failed (retried on the next call)."""
+    try:
+        return _parse_doc_cached(name, data)
+    except _DocParseFailed:
+        return None
+
+def unique_uploads(files) -> list:
+    """Drop uploads whose bytes duplicate an earlier upload, keeping the first."""
+    seen = set()
+    unique = []
+    for f in files:
+        digest = hashlib.blake2b(f.getbuffer(), digest_size=16).digest()
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(f)
+    return unique
+
+def _py_upload_blocks(file):
+    """Prompt block for an uploaded Python file, as (block, display name) pairs."""
+    yield f"# File: {file.name}\n{_decode_text_upload(file)}", file.name
+
+def _zip_upload_blocks(file):
+    """Prompt blocks for each Python file in an uploaded project ZIP."""
+    # Read in memory and cached on the archive bytes
+    try:
+        sources = _zip_python_sources(file.getvalue())
+    except zipfile.BadZipFile as e:
+        handle_and_display_error(e, "extract_project_zip")
+        return
+    for py_file, content, error in sources:
+        if error:
+            st.warning(error)
+            continue
+        name = os.path.basename(py_file)
+        yield f"# File: {name}\n{content}", name
+
+# Code-based test uploads handled directly; any other extension is a requirements document
+CODE_UPLOAD_HANDLERS = {
+    'py': _py_upload_blocks,
+    'zip': _zip_upload_blocks,
+}
+
+def parse_documents(files) -> list:
+    """Extract text from several uploads concurrently, in upload order."""
+    payloads = [(f.name, f.getvalue()) for f in files]
+    if len(payloads) <= 1:
+        return [_parse_doc(name, data) for name, data in payloads]
+    # PDF/DOCX parsing is mostly C code; workers share this run's context so
+    # cache lookups and error messages still reach the page
+    with ThreadPoolExecutor(max_workers=min(8, len(payloads)), initializer=add_script_run_ctx,
+                            initargs=(None, get_script_run_ctx())) as executor:
+        return list(executor.map(lambda payload: _parse_doc(*payload), payloads))
+
 # Helper functions for uploaded projects
+@st.cache_resource
+def _temp_dir_registry() -> set:
+    """Process-wide set of extraction dirs, removed when the server exits."""
+    temp_dirs = set()
+    atexit.register(lambda: [shutil.rmtree(d, ignore_errors=True) for d in list(temp_dirs)])
+    return temp_dirs
+
+# Limits checked before an uploaded project ZIP is extracted (zip bomb guard)
+ZIP_MAX_UNCOMPRESSED_BYTES = 500 * 1024 * 1024
+ZIP_MAX_MEMBERS = 20_000
+
 def extract_project_zip(uploaded_zip) -> str | None:
-    """Extract uploaded project ZIP to a temporary directory."""
+    """Extract uploaded project ZIP to a temporary directory.
+
+    Directories from earlier uploads in this session are removed first, so
+    disk usage stays bounded to the latest upload.
+    """
     try:
+        registry = _temp_dir_registry()
+        for old_dir in st.session_state.get('_temp_dirs', []):
+            shutil.rmtree(old_dir, ignore_errors=True)
+            registry.discard(old_dir)
         temp_dir = tempfile.mkdtemp(prefix="uploaded_project_")
+        st.session_state['_temp_dirs'] = [temp_dir]
+        registry.add(temp_dir)
+        root = Path(temp_dir).resolve()
+        # The upload is already a seekable in-memory buffer; read the archive in place
+        # rather than spooling a second copy to disk, and stream members out below.
+        uploaded_zip.seek(0)
         with zipfile.ZipFile(uploaded_zip, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
+            infos = zip_ref.infolist()
+            if len(infos) > ZIP_MAX_MEMBERS:
+                raise ValueError(f"ZIP archive has {len(infos)} entries (limit {ZIP_MAX_MEMBERS})")
+            total_size = sum(info.file_size for info in infos)
+            if total_size > ZIP_MAX_UNCOMPRESSED_BYTES:
+                raise ValueError(
+                    f"ZIP archive expands to {total_size // (1024 * 1024)} MB "
+                    f"(limit {ZIP_MAX_UNCOMPRESSED_BYTES // (1024 * 1024)} MB)"
+                )
+            progress = st.progress(0.0, text=f"Extracting {uploaded_zip.name}...")
+            step = max(1, len(infos) // 100)  # at most ~100 UI updates
+            for i, info in enumerate(infos, 1):
+                if i % step == 0:
+                    progress.progress(i / len(infos), text=f"Extracting {uploaded_zip.name}...")
+                name = info.filename
+                # Skip directories and macOS metadata entries
+                if info.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('._'):
+                    continue
+                dst = (root / name).resolve()
+                if not dst.is_relative_to(root):
+                    raise ValueError(f"Unsafe path in ZIP archive: {name}")
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                with zip_ref.open(info) as src, open(dst, 'wb') as out:
+                    shutil.copyfileobj(src, out, 65536)
+            progress.empty()
         return temp_dir
     except Exception as e:
         handle_and_display_error(e, "extract_project_zip")
         return None
 
+# Directories that never contain project sources worth scanning
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv', '.mypy_cache',
+             '.pytest_cache', 'dist', 'build', '__MACOSX'}
+
+
 def list_python_files(project_dir: str) -> list[str]:
     """List Python files inside the extracted project."""
     py_files = []
-    for root, _, files in os.walk(project_dir):
-        for f in files:
-            # Skip macOS metadata files and hidden files
-            if f.endswith('.py') and not f.startswith('._') and not f.startswith('.DS_Store'):
-                py_files.append(os.path.join(root, f))
+    stack = [project_dir]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    # Prune dependency/cache trees and hidden directories early
+                    if entry.name not in SKIP_DIRS and not entry.name.startswith('.'):
+                        stack.append(entry.path)
+                elif entry.name.endswith('.py') and not entry.name.startswith('._') and entry.is_file():
+                    py_files.append(entry.path)
     return py_files
 
+@st.cache_data(max_entries=16, show_spinner=False)
+def _zip_python_sources(data: bytes) -> list[tuple[str, str | None, str | None]]:
+    """Read Python sources straight out of a project ZIP as (path, text, error) tuples.
+
+    Applies the same pruning as list_python_files, without extracting to disk.
+    """
+    sources = []
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        for info in zf.infolist():
+            parts = info.filename.split('/')
+            name = parts[-1]
+            if info.is_dir() or not name.endswith('.py') or name.startswith('._'):
+                continue
+            if any(part in SKIP_DIRS or part.startswith('.') for part in parts[:-1]):
+                continue
+            try:
+                sources.append((info.filename, zf.read(info).decode('utf-8'), None))
+            except UnicodeDecodeError as e:
+                sources.append((info.filename, None, f"Could not read {info.filename} due to encoding issues: {e}"))
+            except Exception as e:
+                sources.append((info.filename, None, f"Could not read {info.filename}: {e}"))
+    return sources
+
+# Parses the blocks written by format_file_blocks back out of an LLM reply;
+# the file name can't span lines, so a malformed header fails fast
+_FILE_BLOCK_RE = re.compile(r"<<FILENAME:([^>\n]+)>>\n(.*?)<<END>>", re.DOTALL)
+
+# Per-file cap on project context sent with a Developer feature request
+DEVELOPER_PROMPT_MAX_FILE_CHARS = 20_000
+
+# Lockfiles and generated sources only burn prompt tokens
+GENERATED_FILE_SUFFIXES = ('.lock', '-lock.json', '_pb2.py', '.min.js', '.min.css')
+
+# Onboarding: files longer than this are split into chunks and summarized
+ONBOARDING_CHUNK_CHARS = 8000
+# Upper bound on chunk summaries per documentation run
+ONBOARDING_MAX_CHUNKS = 40
+
+# Approximate input token budget for the onboarding documentation prompt
+ONBOARDING_MAX_PROMPT_TOKENS = 60_000
+# Files that describe a project best get first claim on the budget
+PRIORITY_FILE_NAMES = ("README.md", "main.py", "app.py", "pyproject.toml", "setup.py", "requirements.txt")
+
+def _approx_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4
+
+def budget_context_files(files: dict, max_tokens: int) -> dict:
+    """Fit files into a token budget: priority files first, then smallest first.
+
+    Files are added whole while they fit; the first that doesn't is cut to the
+    remaining budget with a marker and the rest are left out.
+    """
+    ordered = sorted(
+        files.items(),
+        key=lambda item: (os.path.basename(item[0]) not in PRIORITY_FILE_NAMES, len(item[1]))
+    )
+    kept, remaining = {}, max_tokens
+    for fname, content in ordered:
+        if _approx_tokens(content) <= remaining:
+            kept[fname] = content
+            remaining -= _approx_tokens(content)
+            continue
+        if remaining > 0:
+            cut = remaining * 4
+            kept[fname] = f"{content[:cut]}\n# ...truncated {len(content) - cut} chars...\n"
+        break
+    return kept
+
+def summarize_large_files(files: dict, use_cache: bool = False) -> dict:
+    """Replace oversized file contents with batched per-chunk Claude summaries.
+
+    Past ONBOARDING_MAX_CHUNKS the remaining parts are not summarized and the
+    file's entry says so.
+    """
+    jobs = []  # (fname, part, total, chunk)
+    for fname, content in files.items():
+        if len(content) <= ONBOARDING_CHUNK_CHARS:
+            continue
+        chunks = [content[i:i + ONBOARDING_CHUNK_CHARS] for i in range(0, len(content), ONBOARDING_CHUNK_CHARS)]
+        jobs.extend((fname, part, len(chunks), chunk) for part, chunk in enumerate(chunks, 1))
+    jobs = jobs[:ONBOARDING_MAX_CHUNKS]
+    prompts = [
+        f"Summarize part {part}/{total} of {fname} for onboarding documentation: purpose, "
+        f"key classes/functions, dependencies and notable behaviour. Be concise.\n\n{chunk}"
+        for fname, part, total, chunk in jobs
+    ]
+    summaries = {}
+    totals = {}
+    for (fname, part, total, _), summary in zip(jobs, generate_with_claude_batch(prompts, max_tokens=512,
+                                                                                 use_cache=use_cache)):
+        summaries.setdefault(fname, []).append(f"# Summary of part {part}/{total}\n{summary}")
+        totals[fname] = total
+    for fname, parts in summaries.items():
+        if len(parts) < totals[fname]:
+            parts.append(f"# ...truncated: the last {totals[fname] - len(parts)} of {totals[fname]} parts were not summarized...")
+    return {fname: "\n\n".join(summaries[fname]) if fname in summaries else content
+            for fname, content in files.items()}
+
+def format_file_blocks(files: dict, sep: str = "\n", max_files: int | None = None,
+                       max_chars: int | None = None, skip_suffixes: tuple = ()) -> str:
+    """Render files as <<FILENAME:...>> / <<END>> blocks for an LLM prompt in one join.
+
+    Files ending in skip_suffixes are left out and contents longer than
+    max_chars are cut with a marker saying how much was dropped.
+    """
+    def body(content):
+        if max_chars is None or len(content) <= max_chars:
+            return content
+        return f"{content[:max_chars]}\n# ...truncated {len(content) - max_chars} chars...\n"
+
+    kept = ((fname, content) for fname, content in files.items() if not fname.endswith(skip_suffixes))
+    return sep.join(
+        f"<<FILENAME:{fname}>>\n{body(content)}\n<<END>>"
+        for fname, content in itertools.islice(kept, max_files)
+    )
+
+# Protocol v2 and parallel HTTP requests for every remote operation
+GIT_TRANSFER_CONFIG = ["-c", "protocol.version=2", "-c", "http.maxRequests=8"]
+
+def _run_git(args: list[str]):
+    """Run a git command quietly, failing fast instead of prompting for credentials."""
+    subprocess.run(
+        ["git", *GIT_TRANSFER_CONFIG, *args],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+    )
+
+def shallow_clone(repo_url: str, dest: str, branch: str | None = None):
+    """Clone only the tip of branch (default branch if None), fetching blobs lazily and never prompting."""
+    branch_args = ["--branch", branch] if branch else []
+    _run_git(["clone", "--depth", "1", "--single-branch", "--no-tags", "--filter=blob:none",
+              *branch_args, repo_url, dest])
+
+# Fetched repositories are kept here and refreshed instead of re-cloned
+CLONE_CACHE_DIR = APP_CACHE_DIR / "clones"
+CLONE_CACHE_TTL = 7 * 24 * 60 * 60
+
+def _sweep_clone_cache(keep: Path):
+    """Remove cached clones that have not been used within CLONE_CACHE_TTL."""
+    cutoff = time.time() - CLONE_CACHE_TTL
+    with os.scandir(CLONE_CACHE_DIR) as it:
+        for entry in it:
+            if entry.path != str(keep) and entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+def fetch_repo_cached(repo_url: str, ref: str = "HEAD") -> str:
+    """Return a working tree of repo_url at ref (a branch or tag), reusing a cached clone when present.
+
+    A warm cache is updated with a depth-1 fetch and hard reset; a cold one is
+    cloned into a temporary sibling and moved into place when complete.
+    """
+    key = hashlib.sha256(f"{repo_url}@{ref}".encode("utf-8")).hexdigest()
+    cache_dir = CLONE_CACHE_DIR / key
+    CLONE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    if (cache_dir / ".git").exists():
+        _run_git(["-C", str(cache_dir), "fetch", "--depth", "1", "--no-tags", "--filter=blob:none", "origin", ref])
+        _run_git(["-C", str(cache_dir), "reset", "--hard", "FETCH_HEAD"])
+    else:
+        staging = tempfile.mkdtemp(prefix=f"{key}.", dir=CLONE_CACHE_DIR)
+        try:
+            shallow_clone(repo_url, staging, branch=None if ref == "HEAD" else ref)
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            os.replace(staging, cache_dir)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    os.utime(cache_dir)  # mark as recently used for the sweeper
+    _sweep_clone_cache(keep=cache_dir)
+    return str(cache_dir)
+
+# Text-like files loaded from fetched repos and uploaded projects
+DEVELOPER_TEXT_EXTENSIONS = frozenset({".py", ".txt", ".md", ".toml", ".cfg", ".ini", ".yaml", ".yml"})
+ONBOARDING_TEXT_EXTENSIONS = frozenset({".py", ".md", ".txt", ".toml", ".yaml", ".yml"})
+TEXT_FILE_NAMES = frozenset({"Pipfile"})
+# Project files longer than this are skipped (with a warning) rather than cut off
+TEXT_FILE_MAX_CHARS = 512 * 1024
+# Individually uploaded onboarding files larger than this are skipped undecoded
+TEXT_UPLOAD_MAX_BYTES = 2_000_000
+# Threads for project tree reads (I/O bound, so several per core)
+TEXT_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def _read_text_capped(path: str) -> str | None:
+    """Read a text file, stopping one char past TEXT_FILE_MAX_CHARS; None if it can't be opened."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as fp:
+            return fp.read(TEXT_FILE_MAX_CHARS + 1)
+    except OSError:
+        return None
+
+def _warn_skipped_large_files(skipped: list):
+    """Tell the user which project files were left out for being too large."""
+    if skipped:
+        st.warning(
+            f"Skipped {len(skipped)} file(s) over {TEXT_FILE_MAX_CHARS // 1024} KiB: "
+            + ", ".join(sorted(skipped)[:10]) + (" ..." if len(skipped) > 10 else "")
+        )
+
+def read_text_tree(root: str, extensions: frozenset | None, names=TEXT_FILE_NAMES) -> dict:
+    """Read files under root keyed by relative path.
+
+    Files are filtered by name before they are opened (every file when
+    extensions is None), SKIP_DIRS (including .git) are never walked, and files
+    longer than TEXT_FILE_MAX_CHARS are skipped with a warning instead of being
+    passed on truncated. Reads run on a thread pool.
+    """
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            # One set lookup on the suffix rather than an endswith per extension
+            if extensions is None or os.path.splitext(name)[1] in extensions or name in names:
+                paths.append(os.path.join(dirpath, name))
+    # Reads release the GIL, so their latency overlaps
+    files, skipped = {}, []
+    with ThreadPoolExecutor(max_workers=TEXT_READ_WORKERS) as executor:
+        for path, text in zip(paths, executor.map(_read_text_capped, paths)):
+            if text is None:
+                continue
+            rel = os.path.relpath(path, root)
+            if len(text) > TEXT_FILE_MAX_CHARS:
+                skipped.append(rel)
+            else:
+                files[rel] = text
+    _warn_skipped_large_files(skipped)
+    return files
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _zip_text_members(data: bytes, extensions: frozenset | None, names=TEXT_FILE_NAMES) -> tuple[dict, list]:
+    """read_text_tree for a ZIP archive's bytes, without extracting it to disk.
+
+    Returns (files, names of members skipped for exceeding TEXT_FILE_MAX_CHARS).
+    """
+    files, skipped = {}, []
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        for info in zf.infolist():
+            parts = info.filename.split('/')
+            name = parts[-1]
+            if info.is_dir() or name.startswith('._'):
+                continue
+            # Same pruning as the directory walk, and no absolute or parent-relative paths
+            if info.filename.startswith('/') or any(part in SKIP_DIRS or part == '..' for part in parts[:-1]):
+                continue
+            if extensions is not None and not (os.path.splitext(name)[1] in extensions or name in names):
+                continue
+            with zf.open(info) as member:
+                text = io.TextIOWrapper(member, encoding='utf-8', errors='ignore').read(TEXT_FILE_MAX_CHARS + 1)
+            if len(text) > TEXT_FILE_MAX_CHARS:
+                skipped.append(info.filename)
+            else:
+                files[info.filename] = text
+    return files, skipped
+
+def read_zip_text_tree(uploaded_zip, extensions: frozenset | None) -> dict:
+    """Read text files from an uploaded project ZIP keyed by archive path."""
+    try:
+        files, skipped = _zip_text_members(uploaded_zip.getvalue(), extensions)
+    except zipfile.BadZipFile as e:
+        handle_and_display_error(e, "extract_project_zip")
+        return {}
+    _warn_skipped_large_files(skipped)
+    return files
+
+def _dispatch_llm(prompt: str, model: str, temperature: float, max_tokens: int, ai_engine) -> str:
+    """Send a prompt to the selected provider."""
+    if model == "Grok-4":
+        return generate_with_grok(prompt, temperature=temperature)
+    if model == "Claude 3.5 Sonnet":
+        return generate_with_claude(prompt, model_name="claude-3-5-sonnet-20241022",
+                                    temperature=temperature, max_tokens=max_tokens)
+    response = ai_engine.generate_response(prompt, model=model)
+    # Raise instead of returning so provider errors are never cached
+    if response.startswith("Error generating response:"):
+        raise RuntimeError(response)
+    return response
+
+def _persistent_llm(prompt: str, model: str, temperature: float = 0.7, max_tokens: int = 2048,
+                    ai_engine=None, use_cache: bool = True) -> str:
+    """Dispatch through the on-disk LLM cache (or straight to the provider when
+    use_cache is off); safe to call from worker threads."""
+    if not use_cache:
+        return _dispatch_llm(prompt, model, temperature, max_tokens, ai_engine)
+    llm_cache = components['llm_cache']
+    key = llm_cache.make_key(prompt, model, temperature, max_tokens)
+    return llm_cache.get_or_set(key, lambda: _dispatch_llm(prompt, model, temperature, max_tokens, ai_engine))
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_llm(prompt: str, model: str, temperature: float = 0.7, max_tokens: int = 2048,
+                use_persistent_cache: bool = False, _ai_engine=None) -> str:
+    """Dispatch a prompt to the selected provider; identical requests are served from cache."""
+    return _persistent_llm(prompt, model, temperature, max_tokens, _ai_engine, use_cache=use_persistent_cache)
+
+def _extract_balanced(text: str, open_ch: str, close_ch: str) -> str | None:
+    """Return the first balanced open_ch...close_ch span of text in a single pass.
+
+    String literals and escapes are honoured, and commas missing between
+    adjacent objects (``} {``) are inserted on the fly. Returns None when no
+    complete span is found.
+    """
+    start = text.find(open_ch)
+    if start == -1:
+        return None
+    parts = []
+    segment_start = start
+    depth = 0
+    in_string = escape = after_object = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if after_object and not ch.isspace():
+            after_object = False
+            if ch == '{':
+                # Missing comma between two objects
+                parts.append(text[segment_start:i])
+                parts.append(',')
+                segment_start = i
+        if ch == '"':
+            in_string = True
+        elif ch == '[' or ch == '{':
+            depth += 1
+        elif ch == ']' or ch == '}':
+            depth -= 1
+            if depth == 0:
+                if ch != close_ch:
+                    return None
+                parts.append(text[segment_start:i + 1])
+                return ''.join(parts)
+            after_object = ch == '}'
+    return None
+
+def _combine_requirement(document: str, requirement: str) -> str:
+    """Build the combined requirement prompt, reusing the previous run's string when unchanged.
+
+    Kept in session_state rather than st.cache_data, which would unpickle a
+    fresh multi-MB copy on every hit.
+    """
+    key = (len(document), hash(document), requirement)
+    if st.session_state.get('_combined_requirement_key') != key:
+        st.session_state['_combined_requirement_key'] = key
+        st.session_state['_combined_requirement'] = f"Additional Context from Document: {document} Specific Requirements: {requirement}"
+    return st.session_state['_combined_requirement']
+
+def _session_memo(slot: str, fn, *key_parts):
+    """Reuse the last successful result stored under slot when the inputs are unchanged."""
+    key = hashlib.blake2b("|".join(map(str, key_parts)).encode("utf-8"), digest_size=16).digest()
+    if st.session_state.get(f"_{slot}_key") == key:
+        return st.session_state[f"_{slot}_val"]
+    result = fn()
+    # Only cache successful results so failures can be retried
+    if result and not (isinstance(result, dict) and not result.get("success")):
+        st.session_state[f"_{slot}_key"] = key
+        st.session_state[f"_{slot}_val"] = result
+    return result
+
 def suggest_tech_stack(requirement_text, ai_engine, model="gpt-4o-mini"):
     """Suggest appropriate tech stack based on requirements"""
     try:
@@ -458,35 +862,16 @@ def suggest_tech_stack(requirement_text, ai_engine, model="gpt-4o-mini"):
         ]
         """
         
-        if model == "Grok-4":
-            response = generate_with_grok(prompt)
-        elif model == "Claude 3.5 Sonnet":
-            response = generate_with_claude(prompt, model_name="claude-3-5-sonnet-20241022")
-        else:
-            response = ai_engine.generate_response(prompt, model=model)
+        response = _cached_llm(prompt, model,
+                               use_persistent_cache=st.session_state.get('use_persistent_cache', False), _ai_engine=ai_engine)
         
         # Try to parse JSON from response
         try:
             
-            # Clean the response - remove any markdown formatting
-            cleaned_response = response.strip()
-            
-            # Remove markdown code blocks if present
-            cleaned_response = re.sub(r'```json\s*', '', cleaned_response)
-            cleaned_response = re.sub(r'```\s*$', '', cleaned_response)
-            
-            # Insert missing commas between objects in array
-            cleaned_response = re.sub(r'\}\s*\{', '},\n{', cleaned_response)
-            
-            # Find JSON array
-            start_idx = cleaned_response.find('[')
-            end_idx = cleaned_response.rfind(']') + 1
-            
-            if start_idx != -1 and end_idx != 0:
-                array_str = cleaned_response[start_idx:end_idx]
-                # Remove any extra data after the last closing bracket
-                array_str = array_str[:array_str.rfind(']')+1]
-                result = json.loads(array_str)
+            # Locate the outermost JSON array (skips fences, repairs missing commas)
+            array_str = _extract_balanced(response, '[', ']')
+            if array_str is not None:
+                result = _json_loads(array_str)
                 
                 # Validate the structure
                 if isinstance(result, list) and len(result) > 0:
@@ -496,7 +881,7 @@ def suggest_tech_stack(requirement_text, ai_engine, model="gpt-4o-mini"):
                     return []
             else:
                 # Try parsing the entire response as JSON
-                result = json.loads(cleaned_response)
+                result = _json_loads(response.strip())
                 if isinstance(result, list) and len(result) > 0:
                     return result
                 else:
@@ -541,6 +926,8 @@ def generate_project_structure(selected_tech_stack, requirement_text, ai_engine,
         - No additional text, explanations, or markdown formatting
         - Ensure all strings are properly quoted
         - Ensure all brackets and braces are properly closed
+        - List an __init__.py that must contain code (app factory, re-exports, __all__) as
+          {{"name": "__init__.py", "purpose": "..."}}; a bare "__init__.py" is created empty
 
         Example format:
         {{
@@ -549,7 +936,7 @@ def generate_project_structure(selected_tech_stack, requirement_text, ai_engine,
             "structure": {{
                 "root_files": ["file1", "file2", "file3"],
                 "directories": {{
-                    "src/": ["main.py", "config.py", "utils.py"],
+                    "src/": [{{"name": "__init__.py", "purpose": "create_app() application factory"}}, "main.py", "config.py", "utils.py"],
                     "tests/": ["test_main.py", "test_utils.py"],
                     "docs/": ["README.md", "API.md"],
                     "config/": ["settings.py", "database.py"],
@@ -567,35 +954,16 @@ def generate_project_structure(selected_tech_stack, requirement_text, ai_engine,
         Remember: Every array element must be separated by commas, and every object property must be separated by commas.
         """
         
-        if model == "Grok-4":
-            response = generate_with_grok(prompt)
-        elif model == "Claude 3.5 Sonnet":
-            response = generate_with_claude(prompt, model_name="claude-3-5-sonnet-20241022")
-        else:
-            response = ai_engine.generate_response(prompt, model=model)
+        response = _cached_llm(prompt, model,
+                               use_persistent_cache=st.session_state.get('use_persistent_cache', False), _ai_engine=ai_engine)
         
         # Try to parse JSON from response
         try:
             
-            # Clean the response - remove any markdown formatting
-            cleaned_response = response.strip()
-            
-            # Remove markdown code blocks if present
-            cleaned_response = re.sub(r'```json\s*', '', cleaned_response)
-            cleaned_response = re.sub(r'```\s*$', '', cleaned_response)
-            
-            # Insert missing commas between objects in array
-            cleaned_response = re.sub(r'\}\s*\{', '},\n{', cleaned_response)
-            
-            # Find JSON object
-            start_idx = cleaned_response.find('{')
-            end_idx = cleaned_response.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != 0:
-                object_str = cleaned_response[start_idx:end_idx]
-                # Remove any extra data after the last closing brace
-                object_str = object_str[:object_str.rfind('}')+1]
-                result = json.loads(object_str)
+            # Locate the outermost JSON object (skips fences, repairs missing commas)
+            object_str = _extract_balanced(response, '{', '}')
+            if object_str is not None:
+                result = _json_loads(object_str)
                 
                 # Validate the structure
                 if isinstance(result, dict) and result.get("success") is not None:
@@ -604,7 +972,7 @@ def generate_project_structure(selected_tech_stack, requirement_text, ai_engine,
                     return {"success": False, "error": "Invalid project structure response format"}
             else:
                 # Try parsing the entire response as JSON
-                result = json.loads(cleaned_response)
+                result = _json_loads(response.strip())
                 if isinstance(result, dict) and result.get("success") is not None:
                     return result
                 else:
@@ -620,108 +988,290 @@ def generate_project_structure(selected_tech_stack, requirement_text, ai_engine,
         handle_and_display_error(e, "generate_project_structure")
         return {"success": False, "error": str(e)}
 
-def generate_code_for_structure(project_structure, requirement_text, ai_engine, model="gpt-4o-mini"):
-    """Generate complete project files based on project structure"""
-    import os
-    from pathlib import Path
-    
-    import streamlit as st
+def _write_text_file(path, content: str):
+    """Write UTF-8 text with one encode and a raw os.write, bypassing the text I/O layers."""
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]  # os.write may write partially
+    finally:
+        os.close(fd)
+
+# Array-index suffixes such as "[0]" in flattened paths
+_IDX_RE = re.compile(r'\[\d+\]')
+
+# Repeated ".txt" suffixes such as "requirements.txt.txt"
+_DUP_TXT_RE = re.compile(r'(?:\.txt){2,}$')
+
+# Markdown code fences wrapped around LLM file output
+_FENCE_OPEN_RE = re.compile(r'^```[a-zA-Z]*')
+_FENCE_CLOSE_RE = re.compile(r'```$')
+
+# Marker files left empty (no LLM call) unless the structure describes their purpose
+TRIVIAL_FILES = {'__init__.py', '.gitkeep', 'py.typed'}
+
+def _structure_entry(entry) -> tuple[str, str]:
+    """(file name, purpose) for a structure entry: a bare name or a {name, purpose} object."""
+    if isinstance(entry, dict):
+        name = entry.get('name') or entry.get('file') or entry.get('path') or ''
+        purpose = entry.get('purpose') or entry.get('description') or ''
+        return str(name), str(purpose).strip()
+    return str(entry), ''
+
+def generate_code_for_structure(project_structure, requirement_text, ai_engine, model="gpt-4o-mini", save_to_disk=False):
+    """Generate complete project files based on project structure.
+
+    Files are packed into an in-memory ZIP archive; they are only written
+    to generated/code when save_to_disk is set.
+    """
     def flatten_structure(structure):
-        """Flatten the project structure into a list of file paths."""
+        """Flatten the project structure into a list of (file path, purpose)."""
         files = []
         # Root files
         for f in structure.get("root_files", []):
-            files.append(f)
+            files.append(_structure_entry(f))
         # Directory files
         for dir_name, dir_files in structure.get("directories", {}).items():
             for f in dir_files:
-                files.append(os.path.join(dir_name, f))
+                name, purpose = _structure_entry(f)
+                files.append((os.path.join(dir_name, name), purpose))
         return files
 
     try:
-        structure = json.loads(project_structure) if isinstance(project_structure, str) else project_structure
+        structure = _json_loads(project_structure) if isinstance(project_structure, str) else project_structure
         file_paths = flatten_structure(structure)
         all_files = {}
-        # Generate code for each file
-        for file_path in file_paths:
-            # Check if this is a GUI application and modify the prompt accordingly
-            is_gui_app = any(keyword in requirement_text.lower() for keyword in ['gui', 'graphical', 'window', 'interface', 'tkinter', 'calculator'])
-            
-            # Check if this is a Flask/web application
-            is_flask_app = any(keyword in requirement_text.lower() for keyword in ['flask', 'web', 'api', 'server', 'http'])
-            
-            if is_gui_app and file_path.endswith('.py'):
-                file_prompt = f"""
+        # Everything except the file path is invariant across files: build it once
+        requirement_lower = requirement_text.lower()
+        is_gui_app = any(keyword in requirement_lower for keyword in ['gui', 'graphical', 'window', 'interface', 'tkinter', 'calculator'])
+        is_flask_app = any(keyword in requirement_lower for keyword in ['flask', 'web', 'api', 'server', 'http'])
+        prompt_head = f"""
                 Generate the complete content for the following file as part of the project:
                 Project Name: {structure.get('project_name', '')}
                 Project Description: {structure.get('description', '')}
                 Requirements: {requirement_text}
-                File Path: {file_path}
-                Project Structure: {json.dumps(structure, indent=2)}
-                
+                File Path: """
+        structure_line = f"""
+                Project Structure: {_json_dumps(structure)}
+                """
+        closing = """
+                Provide ONLY the code/content for this file, no explanations, no markdown, no extra text.
+                """
+        default_tail = structure_line + closing
+        if is_gui_app:
+            # Applies to .py files of GUI applications
+            py_tail = structure_line + """
                 IMPORTANT: This application will run in a Docker container without GUI support.
                 If this is a GUI application, create a console-based version instead.
                 For calculators, create a command-line interface.
                 For GUI applications, create a text-based menu system.
-                
-                Provide ONLY the code/content for this file, no explanations, no markdown, no extra text.
-                """
-            elif is_flask_app and file_path.endswith('.py'):
-                file_prompt = f"""
-                Generate the complete content for the following file as part of the project:
-                Project Name: {structure.get('project_name', '')}
-                Project Description: {structure.get('description', '')}
-                Requirements: {requirement_text}
-                File Path: {file_path}
-                Project Structure: {json.dumps(structure, indent=2)}
-                
+                """ + closing
+        elif is_flask_app:
+            # Applies to .py files of Flask/web applications
+            py_tail = structure_line + """
                 IMPORTANT: For Flask applications, use port 5001 instead of 5000 to avoid conflicts.
                 Example: app.run(host='0.0.0.0', port=5001, debug=True)
-                
-                Provide ONLY the code/content for this file, no explanations, no markdown, no extra text.
-                """
-            else:
-                file_prompt = f"""
-                Generate the complete content for the following file as part of the project:
-                Project Name: {structure.get('project_name', '')}
-                Project Description: {structure.get('description', '')}
-                Requirements: {requirement_text}
-                File Path: {file_path}
-                Project Structure: {json.dumps(structure, indent=2)}
-                
-                Provide ONLY the code/content for this file, no explanations, no markdown, no extra text.
-                """
-            if model == "Grok-4":
-                file_content = generate_with_grok(file_prompt)
-            elif model == "Claude 3.5 Sonnet":
-                file_content = generate_with_claude(file_prompt, model_name="claude-3-5-sonnet-20241022")
-            else:
-                file_content = ai_engine.generate_response(file_prompt, model=model)
+                """ + closing
+        else:
+            py_tail = default_tail
+        # Generate code for each file
+        for file_path, purpose in file_paths:
+            # Package markers and placeholders need no LLM call, unless the structure
+            # gives them a purpose (e.g. an __init__.py holding an app factory)
+            if os.path.basename(file_path) in TRIVIAL_FILES and not purpose:
+                all_files[file_path] = ''
+                continue
+            purpose_line = f"\n                File Purpose: {purpose}" if purpose else ""
+            file_prompt = prompt_head + file_path + purpose_line + (py_tail if file_path.endswith('.py') else default_tail)
+            file_content = _cached_llm(file_prompt, model,
+                                       use_persistent_cache=st.session_state.get('use_persistent_cache', False), _ai_engine=ai_engine)
             # Clean up any markdown formatting
             file_content = file_content.strip()
-            file_content = re.sub(r'^```[a-zA-Z]*', '', file_content)
-            file_content = re.sub(r'```$', '', file_content)
+            file_content = _FENCE_OPEN_RE.sub('', file_content)
+            file_content = _FENCE_CLOSE_RE.sub('', file_content)
             all_files[file_path] = file_content
-        # Save files in correct structure
+        # Pack everything into a single in-memory archive
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+            for file_path, content in all_files.items():
+                zf.writestr(file_path, content)
+        # Save files in correct structure only when explicitly requested
         saved_files = []
-        for file_path, content in all_files.items():
-            abs_path = Path("generated/code") / file_path
-            abs_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(abs_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            saved_files.append(str(abs_path))
+        if save_to_disk:
+            for file_path, content in all_files.items():
+                abs_path = Path("generated/code") / file_path
+                abs_path.parent.mkdir(parents=True, exist_ok=True)
+                _write_text_file(abs_path, content)
+                saved_files.append(str(abs_path))
         return {
             "success": True,
             "files": all_files,
+            "archive": buf.getvalue(),
             "saved_files": saved_files
         }
     except Exception as e:
         handle_and_display_error(e, "generate_code_for_structure")
         return {"success": False, "error": str(e)}
 
+# Leading "files/" prefix and repeated slashes in generated file names
+_PATH_CLEAN = re.compile(r'^/?(?:files/)?')
+_DBL_SLASH = re.compile(r'/{2,}')
+
+def save_healed_files(final_files: dict, base_dir: str = "generated/code") -> list[dict]:
+    """Write healed project files under base_dir concurrently and return File Manager entries."""
+    items = []
+    for filename, content in final_files.items():
+        # Skip empty content or directory paths
+        if not content or not content.strip() or filename.endswith('/'):
+            continue
+        # Clean filename and create safe path
+        safe_filename = _DBL_SLASH.sub('/', _PATH_CLEAN.sub('', filename)).lstrip('/')
+        if safe_filename:
+            items.append((safe_filename, os.path.join(base_dir, safe_filename), content))
+
+    # Create each target directory once (makedirs is idempotent with exist_ok)
+    for dir_path in {os.path.dirname(abs_path) for _, abs_path, _ in items}:
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+
+    def write_one(item):
+        _, abs_path, content = item
+        _write_text_file(abs_path, content)
+
+    saved_files = []
+    progress = st.progress(0.0, text="Saving files...")
+    # File I/O releases the GIL, so the writes overlap
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(write_one, item): item for item in items}
+        for done, future in enumerate(as_completed(futures), 1):
+            progress.progress(done / len(futures), text=f"Saving files... ({done}/{len(futures)})")
+            safe_filename, abs_path, _ = futures[future]
+            try:
+                future.result()
+            except Exception as file_error:
+                st.warning(f"Could not save {safe_filename}: {file_error}")
+                continue
+            saved_files.append({
+                'name': safe_filename,
+                'path': abs_path,
+                'type': 'code',
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            })
+    progress.empty()
+    return saved_files
+
+def _lang_for(path: str) -> str:
+    """Syntax-highlighting language for st.code."""
+    return 'python' if path.endswith('.py') else 'text'
+
+def render_healing_result(healing_result: dict):
+    """Show the outcome, final files and sandbox output of a healing run."""
+    if healing_result['success']:
+        st.success("Project healed! All code and tests pass.")
+    else:
+        st.warning("Healing attempts exhausted. Showing best effort.")
+    st.subheader("Final Files")
+    final_files = healing_result['final_files']
+    lang_map = {fname: _lang_for(fname) for fname in final_files}
+    for fname, content in final_files.items():
+        with st.expander(fname, expanded=False):
+            st.code(content, language=lang_map[fname])
+    st.subheader("Output")
+    st.code(healing_result['output'])
+    st.subheader("Errors")
+    st.code(healing_result['error'])
+
+def _run_healing(project_files, model, main_file, max_attempts, use_cache, result_queue, cancel_event):
+    """Thread target: run the healing workflow and report the outcome on result_queue."""
+    try:
+        result_queue.put(("done", ai_self_healing_workflow(
+            project_files,
+            code_model=model,
+            main_file=main_file,
+            test_file="test_main.py",
+            max_attempts=max_attempts,
+            cancel_event=cancel_event,
+            use_cache=use_cache
+        )))
+    except Exception as e:
+        result_queue.put(("error", e))
+
+def start_healing_task(project_files, model, main_file, max_attempts=5, use_cache=False):
+    """Start the self-healing workflow in a background thread tracked in session_state.
+
+    use_cache is read here because the worker thread has no session_state access.
+    """
+    task = {
+        "queue": queue.Queue(maxsize=1),
+        "cancel": threading.Event(),
+        "started": time.time(),
+        "attempts": max_attempts,
+    }
+    task["thread"] = threading.Thread(
+        target=_run_healing,
+        args=(project_files, model, main_file, max_attempts, use_cache, task["queue"], task["cancel"]),
+        daemon=True
+    )
+    task["thread"].start()
+    st.session_state.healing_task = task
+
+# Seconds between checks on a running healing task
+HEALING_POLL_INTERVAL = 1.0
+
+@st.fragment(run_every=HEALING_POLL_INTERVAL)
+def render_healing_status():
+    """Show a running healing task's status and Cancel button; collect it when done.
+
+    Only this small fragment re-runs while healing is in progress. Once the
+    result is in, the whole app reruns so the tab, sidebar and File Manager
+    pick it up.
+    """
+    task = st.session_state.healing_task
+    if task is None:
+        return
+    try:
+        status, payload = task["queue"].get_nowait()
+    except queue.Empty:
+        elapsed = int(time.time() - task["started"])
+        st.info(f"Healing in progress ({task['attempts']} attempts max, {elapsed}s elapsed)...")
+        if task["cancel"].is_set():
+            st.caption("Cancelling after the current attempt...")
+        elif st.button("Cancel healing"):
+            task["cancel"].set()
+        return
+    st.session_state.healing_task = None
+    if status == "error":
+        # Shown by the tab after the rerun below
+        st.session_state.healing_error = payload
+    else:
+        st.session_state.last_healing_result = payload
+        record_generated_files(*save_healed_files(payload['final_files']))
+    rerun_app_if_files_changed()
+    st.rerun()
+
 # Helper to render per-tab header (minimal, professional)
 
 
+# Column order of the requirements test case table and its exports
+TEST_CASE_COLUMNS = ["test_id", "description", "category", "subcategory", "device_type", "priority"]
+
+def _excel_column_widths(df) -> list:
+    """Column widths for df: longest header or cell text plus padding, capped at 50."""
+    # Vectorized string lengths instead of a per-cell scan
+    longest = df.astype(str).apply(lambda col: col.str.len().max()) if len(df) else {}
+    return [min(max(int(longest.get(column, 0)), len(str(column))) + 2, 50) for column in df.columns]
+
+def write_test_cases_excel(df, target):
+    """Write test cases as .xlsx to a path or binary buffer, columns sized to their contents."""
+    # constant_memory is not used: pandas writes column by column and
+    # xlsxwriter's streaming mode would silently drop earlier rows.
+    with pd.ExcelWriter(target, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='Test Cases', index=False)
+        worksheet = writer.sheets['Test Cases']
+        for i, width in enumerate(_excel_column_widths(df)):
+            worksheet.set_column(i, i, width)
+
 def render_tab_hero(title, badges, subtitle):
     try:
         chips = ''.join([f"<span class='chip'>{b}</span>" for b in badges])
@@ -729,1193 +1279,1194 @@ def render_tab_hero(title, badges, subtitle):
     except Exception:
         pass
 
-# Main application
-def main():
-    # Per-tab hero is rendered inside each tab
-    
-    # Sidebar for configuration
-    with st.sidebar:
-        st.markdown("""
-            <div style='padding: 18px 16px 12px 16px; background: linear-gradient(135deg, #1e3a8a, #1d4ed8); border-radius: 14px; box-shadow: 0 6px 20px rgba(13, 71, 161, 0.25); margin-bottom: 18px; color: #fff;'>
-                <h3 style='margin-bottom: 8px;'>Configuration</h3>
-                <p style='font-size: 0.95em; opacity: 0.9; margin-bottom: 16px;'>
-                    Pick a model and tune responses. Defaults work well for most cases.
-                </p>
-        """, unsafe_allow_html=True)
-
-        # Model selection
-        model = st.selectbox(
-            "AI Model",
-            ["Gemini 2.5 Pro", "gpt-4o-mini", "gpt-4o", "Claude 3.5 Sonnet", "Grok-4"],
-            index=0,
-            help="Choose the AI model for all operations (code generation, test generation, etc.)"
-        )
-        # Subtle status line in blue theme (replaces red default accents on some themes)
-        st.markdown("<div style='height:6px;border-radius:6px;background:linear-gradient(90deg,#1e88e5,#42a5f5);margin:6px 0 10px 0;'></div>", unsafe_allow_html=True)
-
-        # Temperature setting
-        st.markdown("<div style='color:#0f172a;font-weight:600;margin-top:6px;margin-bottom:2px;'>Creativity</div>", unsafe_allow_html=True)
-        temperature = st.slider(
-            "Creativity",
-            0.0, 1.0, 0.7, 0.1,
-            help="Lower = deterministic, Higher = more creative.",
-            label_visibility="collapsed"
-        )
-
-        # Max tokens
-        st.markdown("<div style='color:#0f172a;font-weight:600;margin-top:6px;margin-bottom:2px;'>Response Length</div>", unsafe_allow_html=True)
-        max_tokens = st.slider(
-            "Response Length",
-            1000, 4000, 2000, 500,
-            help="Maximum tokens in the AI's response.",
-            label_visibility="collapsed"
-        )
+# Bounds for the sidebar listing
+SIDEBAR_MAX_FILES = 500
+SIDEBAR_PAGE_SIZE = 20
+SIDEBAR_PREVIEW_CHARS = 4 * 1024
+SIDEBAR_LAZY_DOWNLOAD_BYTES = 32 * 1024
+
+def _iter_code_files(root: str, base: str):
+    """Yield (rel_path, abs_path) for every file below root, lazily."""
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_code_files(entry.path, base)
+            elif entry.is_file():
+                yield os.path.relpath(entry.path, base), entry.path
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _scan_code_dir(code_dir: str, dir_mtime: float) -> list[tuple[str, str]]:
+    """List (rel_path, abs_path) for generated files; cached per directory mtime."""
+    if not os.path.isdir(code_dir):
+        return []
+    return list(itertools.islice(_iter_code_files(code_dir, code_dir), SIDEBAR_MAX_FILES))
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _read_file_cached(abs_path: str, mtime: float) -> str:
+    """Read a text file; re-read only when its mtime changes."""
+    with open(abs_path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+# (response key, table column) pairs for the tech stack summary table
+TECH_STACK_COLUMNS = (
+    ('id', "ID"),
+    ('name', "Name"),
+    ('language', "Language"),
+    ('framework', "Framework"),
+    ('database', "Database"),
+    ('complexity', "Complexity"),
+    ('estimated_time', "Est. Time"),
+)
 
-        st.markdown("""
-            <div style='font-size: 0.92em; color: rgba(255,255,255,0.9); margin-top: 10px;'>
-                <b>Tip:</b> Defaults are sensible. Raise tokens for long outputs.
-            </div>
-            </div>
-        """, unsafe_allow_html=True)
-
-        st.divider()
-
-        # File management
-        st.header("Generated Files")
-        code_dir = "generated/code"
-        file_list = []
-        for root, _, files in os.walk(code_dir):
-            for f in files:
-                rel_path = os.path.relpath(os.path.join(root, f), code_dir)
-                file_list.append((rel_path, os.path.join(root, f)))
-        st.write("[DEBUG] Files found in generated/code/:", file_list)
-        if file_list:
-            for rel_path, abs_path in file_list:
-                with st.expander(f"{rel_path}"):
-                    st.write(f"**Path:** {abs_path}")
-                    try:
-                        with open(abs_path, 'r', encoding='utf-8') as file:
-                            content = file.read()
-                        st.code(content, language='python' if rel_path.endswith('.py') else 'text')
-                        st.download_button(
-                            label="Download",
-                            data=content,
-                            file_name=rel_path,
-                            mime="text/plain"
-                        )
-                    except Exception as e:
-                        st.error(f"Error reading file: {e}")
-        else:
-            st.info("No files generated yet")
+def render_tech_stack(options):
+    """Render the suggested tech stack table and per-stack details."""
+    st.markdown('<div class="tech-stack-card">', unsafe_allow_html=True)
+    st.subheader("🎯 Recommended Tech Stack Options")
     
-    # Main tabs
-    tab1, tab_test_gen, tab_dev, tab_onboard, tab5 = st.tabs([
+    # Create a table for tech stack options
+    tech_data = [{label: stack.get(key, 'N/A') for key, label in TECH_STACK_COLUMNS} for stack in options]
+    
+    st.table(tech_data)
+    
+    # Show detailed information for each stack
+    for i, stack in enumerate(options):
+        with st.expander(f"📋 {stack.get('name', 'Tech Stack')} - Details"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write("**Dependencies:**")
+                deps = stack.get('dependencies', [])
+                if isinstance(deps, list):
+                    for dep in deps:
+                        st.write(f"• {dep}")
+                else:
+                    st.write(f"• {deps}")
+                
+                st.write("**Tools:**")
+                tools = stack.get('tools', [])
+                if isinstance(tools, list):
+                    for tool in tools:
+                        st.write(f"• {tool}")
+                else:
+                    st.write(f"• {tools}")
+            
+            with col2:
+                st.write("**Pros:**")
+                pros = stack.get('pros', [])
+                if isinstance(pros, list):
+                    for pro in pros:
+                        st.write(f"• {pro}")
+                else:
+                    st.write(f"• {pros}")
+                
+                st.write("**Cons:**")
+                cons = stack.get('cons', [])
+                if isinstance(cons, list):
+                    for con in cons:
+                        st.write(f"• {con}")
+                else:
+                    st.write(f"• {cons}")
+            
+            st.write(f"**Best Use Case:** {stack.get('best_use_case', 'N/A')}")
+            st.write(f"**Deployment:** {stack.get('deployment', 'N/A')}")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@st.fragment
+def render_generated_files():
+    """Sidebar listing of files under generated/code."""
+    st.header("Generated Files")
+    code_dir = "generated/code"
+    # The directory mtime is a coarse key; the TTL picks up changes in nested dirs
+    dir_mtime = os.stat(code_dir).st_mtime if os.path.isdir(code_dir) else 0
+    file_list = _scan_code_dir(code_dir, dir_mtime)
+    if file_list:
+        # Render one page of expanders at a time
+        page_count = (len(file_list) - 1) // SIDEBAR_PAGE_SIZE + 1
+        page = 1
+        if page_count > 1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        start = (page - 1) * SIDEBAR_PAGE_SIZE
+        for rel_path, abs_path in file_list[start:start + SIDEBAR_PAGE_SIZE]:
+            with st.expander(f"{rel_path}"):
+                st.write(f"**Path:** {abs_path}")
+                try:
+                    stat = os.stat(abs_path)
+                    content = _read_file_cached(abs_path, stat.st_mtime)
+                    language = _lang_for(rel_path)
+                    # Only a short preview is shipped to the browser unless asked for
+                    if len(content) > SIDEBAR_PREVIEW_CHARS and not st.toggle("Show full", key=f"show_full_{rel_path}"):
+                        st.code(content[:SIDEBAR_PREVIEW_CHARS], language=language)
+                        st.caption(f"Preview of {stat.st_size:,} bytes")
+                    else:
+                        st.code(content, language=language)
+                    st.download_button(
+                        label="Download",
+                        # Large files are read only when the button is clicked
+                        data=content if stat.st_size <= SIDEBAR_LAZY_DOWNLOAD_BYTES else (lambda p=abs_path: Path(p).read_bytes()),
+                        file_name=rel_path,
+                        mime="text/plain"
+                    )
+                except Exception as e:
+                    st.error(f"Error reading file: {e}")
+    else:
+        st.info("No files generated yet")
+
+
+@st.fragment
+def render_sidebar():
+    """Sidebar configuration; selections are shared through session_state."""
+    st.markdown("""
+        <div style='padding: 18px 16px 12px 16px; background: linear-gradient(135deg, #1e3a8a, #1d4ed8); border-radius: 14px; box-shadow: 0 6px 20px rgba(13, 71, 161, 0.25); margin-bottom: 18px; color: #fff;'>
+            <h3 style='margin-bottom: 8px;'>Configuration</h3>
+            <p style='font-size: 0.95em; opacity: 0.9; margin-bottom: 16px;'>
+                Pick a model and tune responses. Defaults work well for most cases.
+            </p>
+    """, unsafe_allow_html=True)
+
+    # Model selection
+    st.selectbox(
+        "AI Model",
+        ["Gemini 2.5 Pro", "gpt-4o-mini", "gpt-4o", "Claude 3.5 Sonnet", "Grok-4"],
+        index=0,
+        key="selected_model",
+        help="Choose the AI model for all operations (code generation, test generation, etc.)"
+    )
+    # Subtle status line in blue theme (replaces red default accents on some themes)
+    st.markdown("<div style='height:6px;border-radius:6px;background:linear-gradient(90deg,#1e88e5,#42a5f5);margin:6px 0 10px 0;'></div>", unsafe_allow_html=True)
+
+    # Temperature setting
+    st.markdown("<div style='color:#0f172a;font-weight:600;margin-top:6px;margin-bottom:2px;'>Creativity</div>", unsafe_allow_html=True)
+    st.slider(
+        "Creativity",
+        0.0, 1.0, 0.7, 0.1,
+        key="temperature",
+        help="Lower = deterministic, Higher = more creative.",
+        label_visibility="collapsed"
+    )
+
+    # Max tokens
+    st.markdown("<div style='color:#0f172a;font-weight:600;margin-top:6px;margin-bottom:2px;'>Response Length</div>", unsafe_allow_html=True)
+    st.slider(
+        "Response Length",
+        1000, 4000, 2000, 500,
+        key="max_tokens",
+        help="Maximum tokens in the AI's response.",
+        label_visibility="collapsed"
+    )
+
+    # Persistent cache survives restarts; turn off to always get fresh responses
+    st.toggle(
+        "Use persistent cache",
+        value=False,
+        key="use_persistent_cache",
+        help="Reuse LLM responses stored on disk across sessions and restarts."
+    )
+
+    st.markdown("""
+        <div style='font-size: 0.92em; color: rgba(255,255,255,0.9); margin-top: 10px;'>
+            <b>Tip:</b> Defaults are sensible. Raise tokens for long outputs.
+        </div>
+        </div>
+    """, unsafe_allow_html=True)
+
+    st.divider()
+
+    # File management
+    render_generated_files()
+
+
+@st.fragment
+def render_code_generation_tab():
+    """Code Generation tab body."""
+    model = st.session_state.selected_model
+    render_tab_hero(
         "Code Generation",
-        "Test Generator",
-        "Developer",
-        "On Boarding",
-        "File Manager"
-    ])
+        ["Gemini", "GPT-4o", "Claude", "Docker"],
+        "From idea to runnable code — with self-healing."
+    )
+    st.header("Code Generation")
+    st.caption("Turn requirements into runnable code with self-healing and tests.")
     
-
-
-    # Tab 1: Code Generation
-    with tab1:
-        render_tab_hero(
-            "Code Generation",
-            ["Gemini", "GPT-4o", "Claude", "Docker"],
-            "From idea to runnable code — with self-healing."
-        )
-        st.header("Code Generation")
-        st.caption("Turn requirements into runnable code with self-healing and tests.")
-        
-        # Upload section for code generation
-        st.subheader("Requirements")
-        uploaded_file = st.file_uploader(
-            "Upload PDF/DOCX/TXT/MD/CSV or a project ZIP",
-            type=['pdf', 'docx', 'doc', 'txt', 'md', 'csv', 'zip'],
-            help="Upload PDF, Word, text, markdown, CSV, or a zipped project folder"
-        )
-
-        # Process uploaded file and let user choose action
-        if uploaded_file is not None:
-            file_ext = uploaded_file.name.lower().split('.')[-1]
-            if file_ext == 'zip':
+    # Upload section for code generation
+    st.subheader("Requirements")
+    uploaded_file = st.file_uploader(
+        "Upload PDF/DOCX/TXT/MD/CSV or a project ZIP",
+        type=['pdf', 'docx', 'doc', 'txt', 'md', 'csv', 'zip'],
+        help="Upload PDF, Word, text, markdown, CSV, or a zipped project folder"
+    )
+
+    # Process uploaded file and let user choose action
+    if uploaded_file is not None:
+        file_ext = uploaded_file.name.lower().split('.')[-1]
+        if file_ext == 'zip':
+            # Reuse the extraction from an earlier rerun while the same upload is present
+            project_dir = st.session_state.get('uploaded_project_path')
+            if st.session_state.get('_uploaded_zip_id') != uploaded_file.file_id or not (project_dir and os.path.isdir(project_dir)):
                 project_dir = extract_project_zip(uploaded_file)
-                if project_dir:
-                    st.session_state.uploaded_project_path = project_dir
+                st.session_state['_uploaded_zip_id'] = uploaded_file.file_id if project_dir else None
+            if project_dir:
+                st.session_state.uploaded_project_path = project_dir
+                # The extracted tree is immutable, so list it once per directory
+                if st.session_state.get('_uploaded_files_dir') != project_dir:
                     st.session_state.uploaded_project_files = list_python_files(project_dir)
-                    st.success("Project uploaded and extracted")
-            else:
-                st.session_state.uploaded_document = process_uploaded_document(uploaded_file)
-                if st.session_state.uploaded_document:
-                    st.success(f"Document processed: {uploaded_file.name}")
-                    with st.expander("View extracted text"):
-                        st.text_area("Document Content", st.session_state.uploaded_document, height=200)
-            # User action choice
-            st.subheader("Action")
-            user_action = st.radio(
-                "Choose an action:",
-                [
-                    "Generate Code (tech stack, structure, code, tests)",
-                    
-                ],
-                key="user_action_choice"
+                    st.session_state['_uploaded_files_dir'] = project_dir
+                st.success("Project uploaded and extracted")
+        else:
+            st.session_state.uploaded_document = _parse_doc(uploaded_file.name, uploaded_file.getvalue())
+            if st.session_state.uploaded_document:
+                st.success(f"Document processed: {uploaded_file.name}")
+                with st.expander("View extracted text"):
+                    st.text_area("Document Content", st.session_state.uploaded_document, height=200)
+        # User action choice
+        st.subheader("Action")
+        user_action = st.radio(
+            "Choose an action:",
+            [
+                "Generate Code (tech stack, structure, code, tests)",
+                
+            ],
+            key="user_action_choice"
+        )
+        st.session_state.user_action = user_action
+    
+    user_action = st.session_state.get('user_action', None)
+    if user_action == "Generate Code (tech stack, structure, code, tests)":
+        # Requirement input (if not ZIP)
+        if not st.session_state.get('uploaded_project_path', None):
+            st.subheader("Describe Your Requirements")
+            requirement_input = st.text_area(
+                "Enter your requirements in natural language",
+                placeholder="e.g., Create a Python class for a simple calculator that can perform basic arithmetic operations...",
+                height=150
             )
-            st.session_state.user_action = user_action
+            if st.session_state.uploaded_document and requirement_input:
+                combined_requirement = _combine_requirement(st.session_state.uploaded_document, requirement_input)
+            elif st.session_state.uploaded_document:
+                combined_requirement = st.session_state.uploaded_document
+            else:
+                combined_requirement = requirement_input
+            # Sanitize for file naming
+            st.session_state.current_requirement = sanitize_for_filename(combined_requirement)
         
-        user_action = st.session_state.get('user_action', None)
-        if user_action == "Generate Code (tech stack, structure, code, tests)":
-            # Requirement input (if not ZIP)
-            if not st.session_state.get('uploaded_project_path', None):
-                st.subheader("Describe Your Requirements")
-                requirement_input = st.text_area(
-                    "Enter your requirements in natural language",
-                    placeholder="e.g., Create a Python class for a simple calculator that can perform basic arithmetic operations...",
-                    height=150
-                )
-                if st.session_state.uploaded_document and requirement_input:
-                    combined_requirement = f"Additional Context from Document: {st.session_state.uploaded_document} Specific Requirements: {requirement_input}"
-                elif st.session_state.uploaded_document:
-                    combined_requirement = st.session_state.uploaded_document
-                else:
-                    combined_requirement = requirement_input
-                # Sanitize for file naming
-                st.session_state.current_requirement = sanitize_for_filename(combined_requirement)
-            
 
-            # Tech stack suggestion and rest of code generation flow
-            if combined_requirement:
-                # Tech stack suggestion
-                if st.button("Suggest Tech Stack", type="primary"):
-                    if combined_requirement.strip():
-                        with st.spinner("Analyzing requirements and suggesting tech stack..."):
-                            tech_stack_options = suggest_tech_stack(combined_requirement, components['ai_engine'], model)
-                            if tech_stack_options:
-                                st.session_state.tech_stack = tech_stack_options
-                                st.markdown('<div class="tech-stack-card">', unsafe_allow_html=True)
-                                st.subheader("🎯 Recommended Tech Stack Options")
+        # Tech stack suggestion and rest of code generation flow
+        if combined_requirement:
+            # Tech stack suggestion
+            if st.button("Suggest Tech Stack", type="primary"):
+                if combined_requirement.strip():
+                    with st.spinner("Analyzing requirements and suggesting tech stack..."):
+                        tech_stack_options = _session_memo(
+                            "tech_stack",
+                            lambda: suggest_tech_stack(combined_requirement, components['ai_engine'], model),
+                            combined_requirement, model
+                        )
+                        if tech_stack_options:
+                            st.session_state.tech_stack = tech_stack_options
+
+            # Project structure generation
+            if st.session_state.tech_stack:
+                # Drawn from session state so the options stay visible on later reruns
+                render_tech_stack(st.session_state.tech_stack)
+                selected_tech_stack = st.selectbox(
+                    "Select a Tech Stack for Project Structure",
+                    options=[ts['name'] for ts in st.session_state.tech_stack],
+                    index=0
+                )
+                
+                if st.button("Generate Project Structure", type="primary"):
+                    with st.spinner("Generating project structure..."):
+                        try:
+                            # Find the selected tech stack by name
+                            selected_stack_obj = next(
+                                (ts for ts in st.session_state.tech_stack if ts['name'] == selected_tech_stack),
+                                None
+                            )
+                            
+                            if selected_stack_obj:
+                                stack_json = _json_dumps(selected_stack_obj)  # Minified JSON for the prompt
+                                project_structure_result = _session_memo(
+                                    "project_structure",
+                                    lambda: generate_project_structure(
+                                        stack_json,
+                                        combined_requirement,
+                                        components['ai_engine'],
+                                        model
+                                    ),
+                                    stack_json, combined_requirement, model
+                                )
                                 
-                                # Create a table for tech stack options
-                                tech_data = []
-                                for stack in tech_stack_options:
-                                    tech_data.append({
-                                        "ID": stack.get('id', 'N/A'),
-                                        "Name": stack.get('name', 'N/A'),
-                                        "Language": stack.get('language', 'N/A'),
-                                        "Framework": stack.get('framework', 'N/A'),
-                                        "Database": stack.get('database', 'N/A'),
-                                        "Complexity": stack.get('complexity', 'N/A'),
-                                        "Est. Time": stack.get('estimated_time', 'N/A')
+                                if project_structure_result['success']:
+                                    # Save project structure in session state for code generation
+                                    st.session_state['approved_project_structure'] = project_structure_result
+                                    # Save project structure
+                                    project_structure_file = components['file_manager'].save_project_structure_file(
+                                        combined_requirement,
+                                        project_structure_result
+                                    )
+                                    record_generated_files({
+                                        'name': os.path.basename(project_structure_file),
+                                        'path': project_structure_file,
+                                        'type': 'project_structure',
+                                        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                                     })
                                 
-                                st.table(tech_data)
-                                
-                                # Show detailed information for each stack
-                                for i, stack in enumerate(tech_stack_options):
-                                    with st.expander(f"📋 {stack.get('name', 'Tech Stack')} - Details"):
-                                        col1, col2 = st.columns(2)
-                                        
-                                        with col1:
-                                            st.write("**Dependencies:**")
-                                            deps = stack.get('dependencies', [])
-                                            if isinstance(deps, list):
-                                                for dep in deps:
-                                                    st.write(f"• {dep}")
-                                            else:
-                                                st.write(f"• {deps}")
-                                            
-                                            st.write("**Tools:**")
-                                            tools = stack.get('tools', [])
-                                            if isinstance(tools, list):
-                                                for tool in tools:
-                                                    st.write(f"• {tool}")
-                                            else:
-                                                st.write(f"• {tools}")
-                                        
-                                        with col2:
-                                            st.write("**Pros:**")
-                                            pros = stack.get('pros', [])
-                                            if isinstance(pros, list):
-                                                for pro in pros:
-                                                    st.write(f"• {pro}")
-                                            else:
-                                                st.write(f"• {pros}")
-                                            
-                                            st.write("**Cons:**")
-                                            cons = stack.get('cons', [])
-                                            if isinstance(cons, list):
-                                                for con in cons:
-                                                    st.write(f"• {con}")
-                                            else:
-                                                st.write(f"• {cons}")
-                                        
-                                        st.write(f"**Best Use Case:** {stack.get('best_use_case', 'N/A')}")
-                                        st.write(f"**Deployment:** {stack.get('deployment', 'N/A')}")
+                                else:
+                                    st.error(f"Project structure generation failed: {project_structure_result['error']}")
+                            else:
+                                st.warning("Please select a tech stack from the list.")
                                 
-                                st.markdown('</div>', unsafe_allow_html=True)
-
-                # Project structure generation
-                if st.session_state.tech_stack:
-                    selected_tech_stack = st.selectbox(
-                        "Select a Tech Stack for Project Structure",
-                        options=[ts['name'] for ts in st.session_state.tech_stack],
-                        index=0
-                    )
-                    
-                    if st.button("Generate Project Structure", type="primary"):
-                        with st.spinner("Generating project structure..."):
-                            try:
-                                # Find the selected tech stack by name
-                                selected_stack_obj = next(
-                                    (ts for ts in st.session_state.tech_stack if ts['name'] == selected_tech_stack),
-                                    None
+                        except Exception as e:
+                            handle_and_display_error(e, "project_structure_tab")
+
+                # Drawn from session state so it survives the rerun that refreshes the file lists
+                if st.session_state.get('approved_project_structure'):
+                    st.subheader("Project Structure")
+                    st.json(st.session_state['approved_project_structure'])
+            else:
+                st.warning("Please suggest a tech stack first.")
+
+            # Code generation based on structure
+            if st.session_state.tech_stack and st.session_state.current_requirement:
+                # Ensure selected_stack_obj is available
+                selected_stack_obj = None
+                if 'approved_project_structure' in st.session_state and st.session_state['approved_project_structure'].get('tech_stack_name'):
+                    # Try to find the stack object by name
+                    stack_name = st.session_state['approved_project_structure']['tech_stack_name']
+                    selected_stack_obj = next((ts for ts in st.session_state.tech_stack if ts['name'] == stack_name), None)
+                if not selected_stack_obj and st.session_state.tech_stack:
+                    # Fallback: use the first tech stack
+                    selected_stack_obj = st.session_state.tech_stack[0]
+                save_generated = st.checkbox(
+                    "Also save generated files to disk",
+                    value=False,
+                    help="By default the generated project is only offered as a ZIP download."
+                )
+                if st.button("Generate Code", type="primary"):
+                    with st.spinner("Generating and healing code (self-healing workflow)..."):
+                        try:
+                            approved_structure = st.session_state.get('approved_project_structure')
+                            if not approved_structure:
+                                st.error("No approved project structure found. Please generate and approve a project structure first.")
+                            else:
+                                code_result = generate_code_for_structure(
+                                    approved_structure['structure'],
+                                    combined_requirement,
+                                    components['ai_engine'],
+                                    model,
+                                    save_to_disk=save_generated
                                 )
-                                
-                                if selected_stack_obj:
-                                    project_structure_result = generate_project_structure(
-                                        json.dumps(selected_stack_obj, indent=2), # Pass as JSON string
-                                        combined_requirement,
-                                        components['ai_engine'],
-                                        model
-                                    )
+                                if not code_result or not code_result.get('success'):
+                                    st.error("AI generation failed. Please try again with different parameters or check your API configuration.")
+                                    return
+                                if code_result and code_result.get('success'):
+                                    # Kept in session state so the download survives later reruns
+                                    st.session_state.generated_project_archive = code_result['archive']
+                                    project_files = dict(code_result.get('files', {}))
                                     
-                                    if project_structure_result['success']:
-                                        st.success("Project structure generated successfully!")
-                                        st.subheader("Project Structure")
-                                        st.json(project_structure_result)
-                                        # Save project structure in session state for code generation
-                                        st.session_state['approved_project_structure'] = project_structure_result
-                                        # Save project structure
-                                        project_structure_file = components['file_manager'].save_project_structure_file(
-                                            combined_requirement,
-                                            project_structure_result
-                                        )
-                                        st.session_state.generated_files.append({
-                                            'name': os.path.basename(project_structure_file),
-                                            'path': project_structure_file,
-                                            'type': 'project_structure',
-                                            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                        })
-                                        st.info(f"Project structure saved to: {project_structure_file}")
-                                    
-                                    else:
-                                        st.error(f"Project structure generation failed: {project_structure_result['error']}")
-                                else:
-                                    st.warning("Please select a tech stack from the list.")
-                                    
-                            except Exception as e:
-                                handle_and_display_error(e, "project_structure_tab")
-                else:
-                    st.warning("Please suggest a tech stack first.")
-
-                # Code generation based on structure
-                if st.session_state.tech_stack and st.session_state.current_requirement:
-                    # Ensure selected_stack_obj is available
-                    selected_stack_obj = None
-                    if 'approved_project_structure' in st.session_state and st.session_state['approved_project_structure'].get('tech_stack_name'):
-                        # Try to find the stack object by name
-                        stack_name = st.session_state['approved_project_structure']['tech_stack_name']
-                        selected_stack_obj = next((ts for ts in st.session_state.tech_stack if ts['name'] == stack_name), None)
-                    if not selected_stack_obj and st.session_state.tech_stack:
-                        # Fallback: use the first tech stack
-                        selected_stack_obj = st.session_state.tech_stack[0]
-                    if st.button("Generate Code", type="primary"):
-                        with st.spinner("Generating and healing code (self-healing workflow)..."):
-                            try:
-                                approved_structure = st.session_state.get('approved_project_structure')
-                                if not approved_structure:
-                                    st.error("No approved project structure found. Please generate and approve a project structure first.")
-                                else:
-                                    code_result = generate_code_for_structure(
-                                        json.dumps(approved_structure['structure'], indent=2),
-                                        combined_requirement,
-                                        components['ai_engine'],
-                                        model
+                                    # Merge all files from the entire code_result structure into project_files.
+                                    # Walked with an explicit stack; entries already present (from main files) win.
+                                    stack = [(code_result, "")]
+                                    push = stack.append
+                                    add_file = project_files.setdefault
+                                    is_instance = isinstance
+                                    while stack:
+                                        data, prefix = stack.pop()
+                                        for key, value in data.items():
+                                            current_path = f"{prefix}/{key}" if prefix else key
+                                            # If this is a file with content (not a dict)
+                                            if is_instance(value, str) and not key.startswith('_'):
+                                                # Clean up the path (remove array indices and normalize)
+                                                add_file(_IDX_RE.sub('', current_path).replace('//', '/').lstrip('/'), value)
+                                            # If this is a nested structure, descend into it
+                                            elif is_instance(value, dict):
+                                                push((value, current_path))
+                                            # If this is a list, check each item
+                                            elif is_instance(value, list):
+                                                for i, item in enumerate(value):
+                                                    if is_instance(item, dict):
+                                                        push((item, f"{current_path}[{i}]"))
+
+                                    # Normalize repeated extensions (e.g. requirements.txt.txt) once; first entry wins
+                                    normalized_files = {}
+                                    for file_path, content in project_files.items():
+                                        normalized_files.setdefault(_DUP_TXT_RE.sub('.txt', file_path.rstrip('.')), content)
+                                    project_files = normalized_files
+
+                                    # Ensure we have requirements.txt
+                                    if 'requirements.txt' not in project_files:
+                                        st.warning("No requirements.txt found in generated files")
+                                    main_file_name = _detect_main_file_cached(
+                                        project_signature(project_files), project_files, use_llm=True,
+                                        use_cache=st.session_state.get('use_persistent_cache', False)
                                     )
-                                    if not code_result or not code_result.get('success'):
-                                        st.error("AI generation failed. Please try again with different parameters or check your API configuration.")
-                                        return
-                                    if code_result and code_result.get('success'):
-                                        project_files = dict(code_result.get('files', {}))
-                                        
-                                        # Robust requirements.txt extraction - search all nested structures
-                                        def print_nested_structure(data, prefix="", max_depth=3, current_depth=0):
-                                            """Debug function to print nested structure"""
-                                            if current_depth >= max_depth:
-                                                return
-                                            
-                                            if isinstance(data, dict):
-                                                for key, value in data.items():
-                                                    current_path = f"{prefix}/{key}" if prefix else key
-                                                    if isinstance(value, str) and len(value) < 100:
-                                                        print(f"  {'  ' * current_depth}{current_path}: {value[:50]}...")
-                                                    elif isinstance(value, dict):
-                                                        print(f"  {'  ' * current_depth}{current_path}: {{dict}}")
-                                                        print_nested_structure(value, current_path, max_depth, current_depth + 1)
-                                                    elif isinstance(value, list):
-                                                        print(f"  {'  ' * current_depth}{current_path}: [list with {len(value)} items]")
-                                                        for i, item in enumerate(value[:2]):  # Only show first 2 items
-                                                            if isinstance(item, dict):
-                                                                print_nested_structure(item, f"{current_path}[{i}]", max_depth, current_depth + 1)
-                                            elif isinstance(data, list):
-                                                for i, item in enumerate(data[:2]):  # Only show first 2 items
-                                                    if isinstance(item, dict):
-                                                        print_nested_structure(item, f"{prefix}[{i}]", max_depth, current_depth + 1)
-                                        
-                                        def extract_all_files_recursively(data, prefix=""):
-                                            """Recursively extract all files from nested structures"""
-                                            extracted_files = {}
-                                            
-                                            if isinstance(data, dict):
-                                                for key, value in data.items():
-                                                    current_path = f"{prefix}/{key}" if prefix else key
-                                                    
-                                                    # If this is a file with content (not a dict)
-                                                    if isinstance(value, str) and not key.startswith('_'):
-                                                        extracted_files[current_path] = value
-                                                    # If this is a nested structure, recurse
-                                                    elif isinstance(value, dict):
-                                                        nested_files = extract_all_files_recursively(value, current_path)
-                                                        extracted_files.update(nested_files)
-                                                    # If this is a list, check each item
-                                                    elif isinstance(value, list):
-                                                        for i, item in enumerate(value):
-                                                            if isinstance(item, dict):
-                                                                nested_files = extract_all_files_recursively(item, f"{current_path}[{i}]")
-                                                                extracted_files.update(nested_files)
-                                            
-                                            return extracted_files
-                                        
-                                        # Extract all files from the entire code_result structure
-                                        all_files = extract_all_files_recursively(code_result)
-                                        
-                                        # Add all extracted files to project_files
-                                        for file_path, content in all_files.items():
-                                            # Clean up the path (remove array indices and normalize)
-                                            clean_path = file_path.replace('[0]', '').replace('[1]', '').replace('[2]', '')
-                                            clean_path = clean_path.replace('//', '/').lstrip('/')
-                                            
-                                            # Skip if it's already in project_files (from main files)
-                                            if clean_path not in project_files:
-                                                project_files[clean_path] = content
-                                        
-
-                                        
-                                        # Ensure we have requirements.txt (check common locations)
-                                        requirements_found = False
-                                        for req_file in ['requirements.txt', 'requirements.txt.txt', 'requirements.txt.txt.txt']:
-                                            if req_file in project_files:
-                                                requirements_found = True
-
-                                                break
-                                        
-                                        if not requirements_found:
-                                            st.warning("No requirements.txt found in generated files")
-                                        main_file_name = detect_main_file(project_files, use_llm=True)
-                                        if not main_file_name:
-                                            py_files = [f for f in project_files if f.endswith('.py')]
-                                            if py_files:
-                                                main_file_name = st.selectbox("Select the main file to run:", py_files)
-                                            else:
-                                                st.error("No Python files found in generated files.")
-                                                return
-                                        # Store for retry
-                                        st.session_state.last_healing_input = (project_files, model, main_file_name)
-                                        st.session_state.last_main_file_name = main_file_name
-                                        healing_result = ai_self_healing_workflow(
-                                            project_files,
-                                            code_model=model,
-                                            main_file=main_file_name,
-                                            test_file="test_main.py",
-                                            max_attempts=5
-                                        )
-                                        st.session_state.last_healing_result = healing_result
-                                        if healing_result['success']:
-                                            st.success("Project healed! All code and tests pass.")
+                                    if not main_file_name:
+                                        py_files = [f for f in project_files if f.endswith('.py')]
+                                        if py_files:
+                                            main_file_name = st.selectbox("Select the main file to run:", py_files)
                                         else:
-                                            st.warning("Healing attempts exhausted. Showing best effort.")
-                                        st.subheader("Final Files")
-                                        for fname, content in healing_result['final_files'].items():
-                                            with st.expander(fname, expanded=False):
-                                                st.code(content, language='python' if fname.endswith('.py') else 'text')
-                                        st.subheader("Output")
-                                        st.code(healing_result['output'])
-                                        st.subheader("Errors")
-                                        st.code(healing_result['error'])
-                                        saved_files = []
-                                        for filename, content in healing_result['final_files'].items():
-                                            # Skip empty content or directory paths
-                                            if not content or not content.strip() or filename.endswith('/'):
-                                                continue
-                                            
-                                            # Clean filename and create safe path
-                                            safe_filename = filename.replace('files/', '').replace('//', '/').lstrip('/')
-                                            if not safe_filename:
-                                                continue
-                                                
-                                            abs_path = os.path.join("generated/code", safe_filename)
-                                            
-                                            try:
-                                                # Create directory if it doesn't exist
-                                                dir_path = os.path.dirname(abs_path)
-                                                if dir_path and not os.path.exists(dir_path):
-                                                    os.makedirs(dir_path, exist_ok=True)
-                                                
-                                                # Write file content
-                                                with open(abs_path, 'w', encoding='utf-8') as f:
-                                                    f.write(content)
-                                                
-                                                saved_files.append({
-                                                    'name': safe_filename,
-                                                    'path': abs_path,
-                                                    'type': 'code',
-                                                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                                })
-                                            except Exception as file_error:
-                                                st.warning(f"Could not save {safe_filename}: {file_error}")
-                                                continue
-                                        st.session_state.generated_files.extend(saved_files)
-                            except Exception as e:
-                                handle_and_display_error(e, "code_generation_tab")
-
-                # Retry healing button
-                if st.session_state.last_healing_input and st.session_state.last_healing_result and not st.session_state.last_healing_result['success']:
-                    more_attempts = st.number_input("Number of additional healing attempts", min_value=1, max_value=20, value=5, step=1)
-                    if st.button("Retry Healing with More Attempts"):
-                        with st.spinner(f"Retrying healing with {more_attempts} more attempts..."):
-                            project_files, model, main_file_name = st.session_state.last_healing_input
-                            healing_result = ai_self_healing_workflow(
-                                project_files,
-                                code_model=model,
-                                main_file=main_file_name,
-                                test_file="test_main.py",
-                                max_attempts=more_attempts
-                            )
-                            st.session_state.last_healing_result = healing_result
-                            if healing_result['success']:
-                                st.success("Project healed! All code and tests pass.")
-                            else:
-                                st.warning("Healing attempts exhausted. Showing best effort.")
-                            st.subheader("Final Files")
-                            for fname, content in healing_result['final_files'].items():
-                                with st.expander(fname, expanded=False):
-                                    st.code(content, language='python' if fname.endswith('.py') else 'text')
-                            st.subheader("Output")
-                            st.code(healing_result['output'])
-                            st.subheader("Errors")
-                            st.code(healing_result['error'])
-                            saved_files = []
-                            for filename, content in healing_result['final_files'].items():
-                                # Skip empty content or directory paths
-                                if not content or not content.strip() or filename.endswith('/'):
-                                    continue
-                                
-                                # Clean filename and create safe path
-                                safe_filename = filename.replace('files/', '').replace('//', '/').lstrip('/')
-                                if not safe_filename:
-                                    continue
-                                    
-                                abs_path = os.path.join("generated/code", safe_filename)
-                                
-                                try:
-                                    # Create directory if it doesn't exist
-                                    dir_path = os.path.dirname(abs_path)
-                                    if dir_path and not os.path.exists(dir_path):
-                                        os.makedirs(dir_path, exist_ok=True)
-                                    
-                                    # Write file content
-                                    with open(abs_path, 'w', encoding='utf-8') as f:
-                                        f.write(content)
-                                    
-                                    saved_files.append({
-                                        'name': safe_filename,
-                                        'path': abs_path,
-                                        'type': 'code',
-                                        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                    })
-                                except Exception as file_error:
-                                    st.warning(f"Could not save {safe_filename}: {file_error}")
-                                    continue
-                            st.session_state.generated_files.extend(saved_files)
-        
-    # Tab 5: File Manager
-    with tab5:
-        render_tab_hero(
-            "File Manager",
-            ["ZIP Export", "Preview", "History"],
-            "Browse, preview, and export artifacts."
-        )
-        st.header("Files")
-        st.caption("Preview, export, and manage outputs.")
-        
-        if st.session_state.generated_files:
-            st.subheader("Generated Files")
-            
-            # File statistics as KPI cards
-            file_types = {}
-            for file_info in st.session_state.generated_files:
-                file_type = file_info['type']
-                file_types[file_type] = file_types.get(file_type, 0) + 1
-            
-            c1, c2, c3, c4 = st.columns(4)
-            with c1:
-                st.markdown(f"<div class='kpi-card'><div class='label'>Code Files</div><div class='value'>{file_types.get('code', 0)}</div></div>", unsafe_allow_html=True)
-            with c2:
-                st.markdown(f"<div class='kpi-card'><div class='label'>Test Files</div><div class='value'>{file_types.get('test', 0)}</div></div>", unsafe_allow_html=True)
-            with c3:
-                st.markdown(f"<div class='kpi-card'><div class='label'>Assessments</div><div class='value'>{file_types.get('assessment', 0)}</div></div>", unsafe_allow_html=True)
-            with c4:
-                st.markdown(f"<div class='kpi-card'><div class='label'>Total Files</div><div class='value'>{len(st.session_state.generated_files)}</div></div>", unsafe_allow_html=True)
-            
-            # File list
-            for i, file_info in enumerate(st.session_state.generated_files):
-                with st.expander(f"{file_info['name']} ({file_info['type']})"):
-                    col1, col2, col3 = st.columns([2, 1, 1])
-                    
-                    with col1:
-                        st.write(f"**Created:** {file_info['timestamp']}")
-                        st.write(f"**Path:** {file_info['path']}")
-                    
-                    with col2:
-                        if st.button(f"Download", key=f"dl_{i}"):
-                            with open(file_info['path'], 'r') as f:
-                                st.download_button(
-                                    label="Click to download",
-                                    data=f.read(),
-                                    file_name=file_info['name'],
-                                    mime="text/plain"
-                                )
-                    
-                    with col3:
-                        if st.button(f"Delete", key=f"del_{i}"):
-                            try:
-                                os.remove(file_info['path'])
-                                st.session_state.generated_files.pop(i)
-                                st.success("File deleted successfully!")
-                                st.rerun()
-                            except Exception as e:
-                                handle_and_display_error(e, "file_delete")
-            
-            # Export all files
-            if st.button("Export All Files", type="primary"):
-                try:
-                    zip_path = components['file_manager'].create_zip_archive(st.session_state.generated_files)
-                    with open(zip_path, 'rb') as f:
-                        st.download_button(
-                            label="Download ZIP Archive",
-                            data=f.read(),
-                            file_name="generated_files.zip",
-                            mime="application/zip"
-                        )
-                except Exception as e:
-                    handle_and_display_error(e, "create_zip_archive")
-            
-            # Clear all files
-            if st.button("Clear All Files", type="secondary"):
-                try:
-                    for file_info in st.session_state.generated_files:
-                        if os.path.exists(file_info['path']):
-                            os.remove(file_info['path'])
-                    st.session_state.generated_files = []
-                    st.success("All files cleared successfully!")
-                    st.rerun()
-                except Exception as e:
-                    handle_and_display_error(e, "clear_files")
+                                            st.error("No Python files found in generated files.")
+                                            return
+                                    # Store for retry
+                                    st.session_state.last_healing_input = (project_files, model, main_file_name)
+                                    st.session_state.last_main_file_name = main_file_name
+                                    start_healing_task(project_files, model, main_file_name, max_attempts=5,
+                                                       use_cache=st.session_state.get('use_persistent_cache', False))
+                        except Exception as e:
+                            handle_and_display_error(e, "code_generation_tab")
+
+                if st.session_state.generated_project_archive:
+                    st.download_button(
+                        "Download project.zip",
+                        st.session_state.generated_project_archive,
+                        "project.zip",
+                        mime="application/zip"
+                    )
+
+            # Healing runs in the background; a small fragment polls it
+            if st.session_state.healing_task is not None:
+                render_healing_status()
+            if healing_error := st.session_state.pop('healing_error', None):
+                handle_and_display_error(healing_error, "code_generation_tab")
+            if st.session_state.healing_task is None and st.session_state.last_healing_result:
+                render_healing_result(st.session_state.last_healing_result)
+
+            # Retry healing button
+            if (st.session_state.healing_task is None and st.session_state.last_healing_input
+                    and st.session_state.last_healing_result and not st.session_state.last_healing_result['success']):
+                more_attempts = st.number_input("Number of additional healing attempts", min_value=1, max_value=20, value=5, step=1)
+                if st.button("Retry Healing with More Attempts"):
+                    project_files, model, main_file_name = st.session_state.last_healing_input
+                    # A retry restarts from the same input, so cached fixes would just replay the failure
+                    start_healing_task(project_files, model, main_file_name, max_attempts=more_attempts, use_cache=False)
+                    st.rerun(scope="fragment")
+
+    rerun_app_if_files_changed()
+
+
+@st.fragment
+def render_developer_tab():
+    """Developer tab body."""
+    render_tab_hero(
+        "Developer",
+        ["Claude", "Healing", "Docker"],
+        "Ship new features with confidence."
+    )
+    st.header("Developer")
+    st.caption("Implement new features with iterative healing.")
+
+    source_choice = st.radio("Source", ["Upload ZIP/Files", "GitHub URL"], horizontal=True)
+    project_files = {}
+    repo_url = None
+
+    if source_choice == "Upload ZIP/Files":
+        up = st.file_uploader("Upload project ZIP or multiple .py files", type=["zip", "py"], accept_multiple_files=True)
+        if up:
+            for f in up:
+                if f.name.lower().endswith(".zip"):
+                    project_files.update(read_zip_text_tree(f, None))
+                elif f.name.lower().endswith(".py"):
+                    try:
+                        project_files[f.name] = _decode_text_upload(f)
+                    except Exception:
+                        pass
+    else:
+        repo_url = st.text_input("GitHub repository URL", placeholder="https://github.com/owner/repo")
+        repo_branch = st.text_input("Branch or tag (optional)", placeholder="default branch")
+        if repo_url and st.button("Fetch Repo"):
+            try:
+                repo_dir = fetch_repo_cached(repo_url, repo_branch.strip() or "HEAD")
+                # Only load text-like files to avoid binary
+                project_files.update(read_text_tree(repo_dir, DEVELOPER_TEXT_EXTENSIONS))
+                st.success("Repository fetched.")
+            except Exception as e:
+                handle_and_display_error(e, "github_fetch")
+
+    feature_prompt = st.text_area("Describe the new feature to implement", height=140, placeholder="Add a new endpoint /reports that returns aggregated analytics, update auth, add tests, and update requirements if needed.")
+    max_attempts = st.slider("Max healing iterations", 1, 7, 5)
+    run_button = st.button("Implement Feature and Run")
+
+    if run_button:
+        if not project_files:
+            st.warning("Please provide code via upload or GitHub.")
+        elif not feature_prompt.strip():
+            st.warning("Please describe the feature to implement.")
         else:
-            st.info("No files generated yet. Start by generating some code!")
+            try:
+                # Determine main file
+                main_file = _detect_main_file_cached(
+                    project_signature(project_files), project_files, use_llm=True,
+                    use_cache=st.session_state.get('use_persistent_cache', False)
+                ) or "main.py"
+
+                # Ask Claude to implement feature by returning updated files
+                files_str = format_file_blocks(project_files, max_chars=DEVELOPER_PROMPT_MAX_FILE_CHARS,
+                                               skip_suffixes=GENERATED_FILE_SUFFIXES)
+                st.caption(f"Prompt: {len(files_str):,} chars of project context")
+                # Claude only sees the head of these, so a rewrite would drop the rest
+                truncated_files = sorted(
+                    fname for fname, content in project_files.items()
+                    if len(content) > DEVELOPER_PROMPT_MAX_FILE_CHARS and not fname.endswith(GENERATED_FILE_SUFFIXES)
+                )
+                read_only_note = (
+                    "READ-ONLY FILES (shown truncated; do NOT return them): " + ", ".join(truncated_files)
+                    if truncated_files else ""
+                )
+                prompt = f"""
+You are a senior software engineer. Implement the following feature in the provided project. Modify or add files as needed, including tests and requirements.
+
+FEATURE REQUEST:
+{feature_prompt}
+
+PROJECT FILES:
+{files_str}
+
+{read_only_note}
+
+Return ONLY updated and new files in this exact format, for each file:
+<<FILENAME:path/filename.ext>>
+<file content>
+<<END>>
+"""
+                claude_resp = _cached_llm(prompt, "Claude 3.5 Sonnet", max_tokens=3500,
+                                          use_persistent_cache=st.session_state.get('use_persistent_cache', False))
+
+                
+                updates = {m.group(1).strip(): m.group(2) for m in _FILE_BLOCK_RE.finditer(claude_resp)}
+                rejected = [fname for fname in updates if fname in truncated_files]
+                if rejected:
+                    st.warning(f"Ignored rewrites of truncated files: {', '.join(rejected)}")
+                    for fname in rejected:
+                        del updates[fname]
+                if updates:
+                    project_files.update(updates)
+
+                # Run self-healing loop in Docker
+                result = ai_self_healing_workflow(project_files, code_model="claude-3-5-sonnet-20241022", main_file=main_file, max_attempts=max_attempts,
+                                                  use_cache=st.session_state.get('use_persistent_cache', False))
+
+                # Save final files to File Manager; the outcome is shown below from session state
+                st.session_state.last_feature_result = result
+                saved_paths = components['file_manager'].save_project_files(feature_prompt, result.get("final_files", {}))
+                for saved in saved_paths:
+                    record_generated_files({
+                        'name': os.path.basename(saved),
+                        'path': saved,
+                        'type': 'code',
+                        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    })
+            except Exception as e:
+                handle_and_display_error(e, "developer_tab")
+
+    if result := st.session_state.last_feature_result:
+        if result.get("success"):
+            st.success("Feature implemented and project runs successfully.")
+        else:
+            st.warning("Completed iterations but errors remain. Saving latest files anyway.")
+        st.subheader("Docker Output")
+        st.code(result.get("output", ""))
+        if err := result.get("error"):
+            st.error(err)
+
+    rerun_app_if_files_changed()
+
+
+@st.fragment
+def render_onboarding_tab():
+    """On Boarding tab body."""
+    render_tab_hero(
+        "On Boarding",
+        ["Docs", "Diagrams", "Insights"],
+        "Understand any codebase quickly."
+    )
+    st.header("Onboarding")
+    st.caption("Generate clear docs and flow diagrams.")
+
+    source_choice2 = st.radio("Source", ["Upload ZIP/Files", "GitHub URL"], horizontal=True, key="onboard_src")
+    onboard_files = {}
+    repo_url2 = None
+
+    if source_choice2 == "Upload ZIP/Files":
+        up2 = st.file_uploader("Upload project ZIP or multiple files", type=["zip", "py", "md", "txt"], accept_multiple_files=True, key="onboard_upload")
+        if up2:
+            for f in up2:
+                if f.name.lower().endswith(".zip"):
+                    onboard_files.update(read_zip_text_tree(f, ONBOARDING_TEXT_EXTENSIONS))
+                elif f.size > TEXT_UPLOAD_MAX_BYTES:
+                    st.warning(f"Skipped {f.name}: larger than {TEXT_UPLOAD_MAX_BYTES // 1_000_000} MB.")
+                else:
+                    try:
+                        onboard_files[f.name] = _decode_text_upload(f)
+                    except Exception:
+                        pass
+    else:
+        repo_url2 = st.text_input("GitHub repository URL", placeholder="https://github.com/owner/repo", key="onboard_repo")
+        repo_branch2 = st.text_input("Branch or tag (optional)", placeholder="default branch", key="onboard_branch")
+        if repo_url2 and st.button("Fetch Repo", key="onboard_fetch"):
+            try:
+                repo_dir = fetch_repo_cached(repo_url2, repo_branch2.strip() or "HEAD")
+                onboard_files.update(read_text_tree(repo_dir, ONBOARDING_TEXT_EXTENSIONS))
+                st.success("Repository fetched.")
+            except Exception as e:
+                handle_and_display_error(e, "onboard_github_fetch")
+
+    doc_prompt_extra = st.text_area("Focus areas (optional)", placeholder="Explain the architecture, modules, data flow, key APIs, setup steps, and how to extend.")
+    gen_doc_btn = st.button("Generate Documentation")
+
+    if gen_doc_btn:
+        if not onboard_files:
+            st.warning("Please provide a project via upload or GitHub.")
+        else:
+            try:
+                # Build combined context
+                # Fit all files to a token budget (priority files first), then
+                # summarize chunk by chunk only the large files the budget kept
+                context_files = budget_context_files(onboard_files, ONBOARDING_MAX_PROMPT_TOKENS)
+                if any(len(content) > ONBOARDING_CHUNK_CHARS for content in context_files.values()):
+                    with st.spinner("Summarizing large files..."):
+                        context_files = summarize_large_files(
+                            context_files, use_cache=st.session_state.get('use_persistent_cache', False)
+                        )
+                files_str = format_file_blocks(context_files, sep="\n\n")
+
+                doc_prompt = f"""
+You are a senior developer advocate. Create comprehensive onboarding documentation for the following project with clear sections: Overview, Architecture, Module/Directory Guide, Setup & Run, Development Workflow, Key APIs/Endpoints, Data Flow, Testing, Deployment, and How to Extend. Include concise flow diagrams in Mermaid when useful.
+
+PROJECT FILES (partial):
+{files_str}
+
+EXTRA FOCUS (optional): {doc_prompt_extra}
+
+Return ONLY Markdown. Include Mermaid diagrams using ```mermaid blocks when appropriate.
+"""
+                # Render the document as it streams in
+                st.subheader("Preview")
+                doc_markdown = stream_llm_to_page(doc_prompt, "Claude 3.5 Sonnet", max_tokens=3500)
+
+                # Save to assessments/docs
+                filename = f"ONBOARDING_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+                saved = components['file_manager'].save_project_file("onboarding", filename, doc_markdown)
+                record_generated_files({
+                    'name': os.path.basename(saved),
+                    'path': saved,
+                    'type': 'assessment',
+                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                })
+                st.session_state.last_onboarding_doc = doc_markdown
+            except Exception as e:
+                handle_and_display_error(e, "onboarding_tab")
+    elif st.session_state.last_onboarding_doc:
+        # Redrawn after the rerun that refreshes the file lists
+        st.success("Documentation generated and saved to File Manager.")
+        st.subheader("Preview")
+        st.markdown(st.session_state.last_onboarding_doc)
+
+    rerun_app_if_files_changed()
+
+
+@st.fragment
+def render_file_manager_tab():
+    """File Manager tab body."""
+    render_tab_hero(
+        "File Manager",
+        ["ZIP Export", "Preview", "History"],
+        "Browse, preview, and export artifacts."
+    )
+    st.header("Files")
+    st.caption("Preview, export, and manage outputs.")
     
-    # Tab 6: Test Generator
-    with tab_test_gen:
-        render_tab_hero(
-            "Test Generator",
-            ["pytest", "Coverage", "Agents"],
-            "Design robust tests — faster."
-        )
+    if st.session_state.generated_files:
+        st.subheader("Generated Files")
         
-        # Test Generation Mode Selection
-        test_mode = st.radio(
-            "Test Generation Mode",
-            ["Code-Based Tests", "Requirements-Based Tests"],
-            help="Choose whether to generate tests from existing code or from requirements specifications"
-        )
+        # File statistics as KPI cards
+        file_types = Counter(file_info['type'] for file_info in st.session_state.generated_files)
         
-        # Check API keys for selected model
-        if model == "Claude 3.5 Sonnet" and not os.environ.get("CLAUDE_API_KEY"):
-            st.warning("⚠️ Claude API key not found. Please set CLAUDE_API_KEY in your environment.")
-        elif model == "Grok-4" and not os.environ.get("GROK4_API_KEY"):
-            st.warning("⚠️ Grok-4 API key not found. Please set GROK4_API_KEY in your environment.")
+        kpis = [
+            ("Code Files", file_types['code']),
+            ("Test Files", file_types['test']),
+            ("Assessments", file_types['assessment']),
+            ("Total Files", len(st.session_state.generated_files)),
+        ]
+        # One markdown element for the whole row instead of one per card
+        cards = "".join(
+            f"<div class='kpi-card'><div class='label'>{label}</div><div class='value'>{value}</div></div>"
+            for label, value in kpis
+        )
+        st.markdown(f"<div class='kpi-row'>{cards}</div>", unsafe_allow_html=True)
         
-        # Check if any AI models are available
-        ai_models_available = any([
-            os.environ.get("OPENAI_API_KEY"),
-            os.environ.get("GOOGLE_API_KEY"),
-            os.environ.get("CLAUDE_API_KEY"),
-            os.environ.get("GROK4_API_KEY")
-        ])
+        # File list
+        pending_deletes = []
+        for i, file_info in enumerate(st.session_state.generated_files):
+            with st.expander(f"{file_info['name']} ({file_info['type']})"):
+                col1, col2, col3 = st.columns([2, 1, 1])
+                
+                with col1:
+                    st.write(f"**Created:** {file_info['timestamp']}")
+                    st.write(f"**Path:** {file_info['path']}")
+                
+                with col2:
+                    # Bytes are read only when the user actually clicks
+                    st.download_button(
+                        label="Download",
+                        data=lambda path=file_info['path']: Path(path).read_bytes(),
+                        file_name=file_info['name'],
+                        mime="application/octet-stream",
+                        key=f"dl_{i}"
+                    )
+                
+                with col3:
+                    if st.button(f"Delete", key=f"del_{i}"):
+                        pending_deletes.append(i)
         
-        if not ai_models_available:
-            st.error("❌ No AI API keys found! Requirements-based test generation requires at least one AI model.")
-            st.info("💡 To fix this:")
-            st.info("1. Create a .env file with your API keys")
-            st.info("2. Get API keys from: OpenAI, Google AI, Claude, or Grok-4")
-            st.info("3. Required keys: OPENAI_API_KEY, GOOGLE_API_KEY, CLAUDE_API_KEY, or GROK4_API_KEY")
-            st.stop()
+        # Apply deletes after the loop so indices stay valid while rendering
+        if pending_deletes:
+            try:
+                for idx in sorted(set(pending_deletes), reverse=True):
+                    file_path = st.session_state.generated_files[idx]['path']
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    del st.session_state.generated_files[idx]
+                # App scope, so the sidebar fragment drops the deleted files too
+                _scan_code_dir.clear()
+                st.rerun()
+            except OSError as e:
+                handle_and_display_error(e, "file_delete")
         
-        # Test-specific upload area
-        if test_mode == "Code-Based Tests":
-            # File uploader for code-based testing
-            uploaded_files = st.file_uploader(
-                "Upload Python files or project ZIP to generate unit tests",
-                type=['py', 'zip'],
-                accept_multiple_files=True,
-                help="Upload Python files (.py) or project ZIP to generate comprehensive unit tests"
-            )
-        else:
-            # File uploader for requirements-based testing
-            uploaded_files = st.file_uploader(
-                "Upload requirements documents to generate test cases",
-                type=['pdf', 'docx', 'doc', 'txt', 'md', 'csv'],
-                accept_multiple_files=True,
-                help="Upload requirements documents (PDF, DOCX, TXT, MD, CSV) to generate comprehensive test cases"
-            )
-        
-        # Prompt box
-        custom_prompt = st.text_area(
-            "Custom Test Requirements",
-            placeholder="Describe specific test scenarios, edge cases, testing frameworks, or any special requirements...",
-            height=120,
-            help="Add specific test requirements, edge cases, or testing preferences"
+        # Export all files: the archive is built in memory only when the button is clicked
+        export_list = list(st.session_state.generated_files)
+        st.download_button(
+            label="Export All Files",
+            data=lambda: components['file_manager'].create_zip_bytes(export_list),
+            file_name="generated_files.zip",
+            mime="application/zip",
+            type="primary"
         )
         
-        # Test case count slider (only for Requirements-Based Tests)
-        if test_mode == "Requirements-Based Tests":
-            test_case_count = st.slider(
-                "Number of Test Cases to Generate",
-                min_value=10,
-                max_value=500,
-                value=100,
-                step=10,
-                help="Choose how many test cases to generate (10-500)"
-            )
-        
-        # Generate button
-        if st.button("Generate Tests", type="primary", key="generate_tests_unified"):
-            if not uploaded_files:
-                st.warning("Please upload files to generate tests.")
-            else:
-                try:
-                    if test_mode == "Requirements-Based Tests":
-                        # Requirements-based test generation
-                        with st.spinner("Generating comprehensive test cases from requirements..."):
-                            # Process uploaded requirements documents
-                            all_content = []
-                            for file in uploaded_files:
-                                doc_content = process_uploaded_document(file)
-                                if doc_content:
-                                    all_content.append(f"# Requirements from: {file.name}\n{doc_content}")
+        # Clear all files
+        if st.button("Clear All Files", type="secondary"):
+            try:
+                for file_info in st.session_state.generated_files:
+                    if os.path.exists(file_info['path']):
+                        os.remove(file_info['path'])
+                st.session_state.generated_files = []
+                st.success("All files cleared successfully!")
+                _scan_code_dir.clear()
+                st.rerun()
+            except Exception as e:
+                handle_and_display_error(e, "clear_files")
+    else:
+        st.info("No files generated yet. Start by generating some code!")
+
+def requirements_test_exports(test_cases):
+    """DataFrame and .xlsx bytes for test_cases, rebuilt only when the cases change."""
+    def build_exports():
+        # Fixed-order tuples spare pandas per-row key alignment
+        frame = pd.DataFrame(
+            [tuple(tc.get(col, '') for col in TEST_CASE_COLUMNS) for tc in test_cases],
+            columns=TEST_CASE_COLUMNS
+        )
+        excel_buffer = io.BytesIO()
+        write_test_cases_excel(frame, excel_buffer)
+        return frame, excel_buffer.getvalue()
+
+    return _session_memo("test_case_exports", build_exports, _json_dumps(test_cases))
+
+def render_requirements_test_result(saved: dict):
+    """Show the last requirements-based test cases with Excel and JSON downloads."""
+    test_cases = saved['test_cases']
+    st.success(f"✅ Generated {len(test_cases)} test cases successfully!")
+    df, excel_data = requirements_test_exports(test_cases)
+    st.dataframe(df, use_container_width=True)
+    
+    # Download buttons
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Download Excel File",
+            excel_data,
+            file_name=f"test_cases_{saved['timestamp']}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+    
+    with col2:
+        # Also provide JSON download
+        st.download_button(
+            "Download JSON File",
+            _json_dumps({"test_cases": test_cases}, indent=True),
+            file_name=f"test_cases_{saved['timestamp']}.json",
+            mime="application/json"
+        )
+    
+    # Show analysis
+    if saved.get('analysis'):
+        st.subheader("📊 Analysis")
+        st.json(saved['analysis'])
+
+@st.fragment
+def render_test_generator_tab():
+    """Test Generator tab body."""
+    model = st.session_state.selected_model
+
+    render_tab_hero(
+        "Test Generator",
+        ["pytest", "Coverage", "Agents"],
+        "Design robust tests — faster."
+    )
+    
+    # Test Generation Mode Selection
+    test_mode = st.radio(
+        "Test Generation Mode",
+        ["Code-Based Tests", "Requirements-Based Tests"],
+        help="Choose whether to generate tests from existing code or from requirements specifications"
+    )
+    
+    # Check API keys for selected model
+    if model == "Claude 3.5 Sonnet" and not os.environ.get("CLAUDE_API_KEY"):
+        st.warning("⚠️ Claude API key not found. Please set CLAUDE_API_KEY in your environment.")
+    elif model == "Grok-4" and not os.environ.get("GROK4_API_KEY"):
+        st.warning("⚠️ Grok-4 API key not found. Please set GROK4_API_KEY in your environment.")
+    
+    # Check if any AI models are available
+    ai_models_available = any([
+        os.environ.get("OPENAI_API_KEY"),
+        os.environ.get("GOOGLE_API_KEY"),
+        os.environ.get("CLAUDE_API_KEY"),
+        os.environ.get("GROK4_API_KEY")
+    ])
+    
+    if not ai_models_available:
+        st.error("❌ No AI API keys found! Requirements-based test generation requires at least one AI model.")
+        st.info("💡 To fix this:")
+        st.info("1. Create a .env file with your API keys")
+        st.info("2. Get API keys from: OpenAI, Google AI, Claude, or Grok-4")
+        st.info("3. Required keys: OPENAI_API_KEY, GOOGLE_API_KEY, CLAUDE_API_KEY, or GROK4_API_KEY")
+        st.stop()
+    
+    # Test-specific upload area
+    if test_mode == "Code-Based Tests":
+        # File uploader for code-based testing
+        uploaded_files = st.file_uploader(
+            "Upload Python files or project ZIP to generate unit tests",
+            type=['py', 'zip'],
+            accept_multiple_files=True,
+            help="Upload Python files (.py) or project ZIP to generate comprehensive unit tests"
+        )
+    else:
+        # File uploader for requirements-based testing
+        uploaded_files = st.file_uploader(
+            "Upload requirements documents to generate test cases",
+            type=['pdf', 'docx', 'doc', 'txt', 'md', 'csv'],
+            accept_multiple_files=True,
+            help="Upload requirements documents (PDF, DOCX, TXT, MD, CSV) to generate comprehensive test cases"
+        )
+    
+    # Prompt box
+    custom_prompt = st.text_area(
+        "Custom Test Requirements",
+        placeholder="Describe specific test scenarios, edge cases, testing frameworks, or any special requirements...",
+        height=120,
+        help="Add specific test requirements, edge cases, or testing preferences"
+    )
+    
+    # Test case count slider (only for Requirements-Based Tests)
+    if test_mode == "Requirements-Based Tests":
+        test_case_count = st.slider(
+            "Number of Test Cases to Generate",
+            min_value=10,
+            max_value=500,
+            value=100,
+            step=10,
+            help="Choose how many test cases to generate (10-500)"
+        )
+        persist_excel = st.checkbox(
+            "Also save the Excel file to disk",
+            value=False,
+            help="By default the workbook is only offered as a download; saving also lists it in the File Manager."
+        )
+    
+    # Generate button
+    if st.button("Generate Tests", type="primary", key="generate_tests_unified"):
+        if not uploaded_files:
+            st.warning("Please upload files to generate tests.")
+        else:
+            # Identical uploads under different names would only inflate the prompt
+            uploaded_files = unique_uploads(uploaded_files)
+            try:
+                if test_mode == "Requirements-Based Tests":
+                    # Requirements-based test generation
+                    with st.spinner("Generating comprehensive test cases from requirements..."):
+                        # Process uploaded requirements documents straight into one string
+                        combined_content = "\n\n".join(
+                            f"# Requirements from: {file.name}\n{doc_content}"
+                            for file, doc_content in zip(uploaded_files, parse_documents(uploaded_files))
+                            if doc_content
+                        )
+                        
+                        if combined_content:
+                            # Add custom prompt if provided
+                            if custom_prompt.strip():
+                                combined_content += f"\n\nAdditional Requirements:\n{custom_prompt}"
                             
-                            if all_content:
-                                # Combine all content
-                                combined_content = "\n\n".join(all_content)
-                                
-                                # Add custom prompt if provided
-                                if custom_prompt.strip():
-                                    combined_content += f"\n\nAdditional Requirements:\n{custom_prompt}"
-                                
-                                # Generate requirements-based tests using Generator with selected model
-                                result = components['generator'].generate_requirements_tests(
-                                    requirements=combined_content,
-                                    test_count=test_case_count,
-                                    model=map_model_name(model)
-                                )
-                                
-                                if result['success']:
-                                    # Display results
-                                    st.success(f"✅ Generated {len(result['test_cases'])} test cases successfully!")
-                                    
-                                    # Create DataFrame for display
-                                    import pandas as pd
-                                    df = pd.DataFrame(result['test_cases'])
-                                    st.dataframe(df, use_container_width=True)
-                                    
-                                    # Export to Excel
-                                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                            # Generate requirements-based tests using Generator with selected model,
+                            # streaming so progress shows and surplus cases are never waited for
+                            progress = st.progress(0.0, text="Generating test cases...")
+                            result = components['generator'].generate_requirements_tests(
+                                requirements=combined_content,
+                                test_count=test_case_count,
+                                model=map_model_name(model),
+                                on_progress=lambda done, total: progress.progress(
+                                    done / total, text=f"Generating test cases... ({done}/{total})")
+                            )
+                            progress.empty()
+                            
+                            if result['success']:
+                                # Shown below from session state so it survives later reruns
+                                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                                st.session_state.requirements_test_result = {
+                                    'test_cases': result['test_cases'],
+                                    'analysis': result.get('analysis'),
+                                    'timestamp': timestamp,
+                                }
+                                # The workbook is built in memory and only written to
+                                # disk when the user asked to keep it
+                                if persist_excel:
+                                    _, excel_data = requirements_test_exports(result['test_cases'])
                                     excel_filename = f"test_cases_{timestamp}.xlsx"
-                                    
-                                    with pd.ExcelWriter(excel_filename, engine='openpyxl') as writer:
-                                        df.to_excel(writer, sheet_name='Test Cases', index=False)
-                                        
-                                        # Auto-adjust column widths
-                                        worksheet = writer.sheets['Test Cases']
-                                        for column in worksheet.columns:
-                                            max_length = 0
-                                            column_letter = column[0].column_letter
-                                            for cell in column:
-                                                try:
-                                                    if len(str(cell.value)) > max_length:
-                                                        max_length = len(str(cell.value))
-                                                except (TypeError, AttributeError):
-                                                    pass
-                                            adjusted_width = min(max_length + 2, 50)
-                                            worksheet.column_dimensions[column_letter].width = adjusted_width
-                                    
-                                    # Download buttons
-                                    col1, col2 = st.columns(2)
-                                    with col1:
-                                        with open(excel_filename, 'rb') as f:
-                                            st.download_button(
-                                                "Download Excel File",
-                                                f.read(),
-                                                file_name=excel_filename,
-                                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                                            )
-                                    
-                                    with col2:
-                                        # Also provide JSON download
-                                        test_cases_filename = f"test_cases_{timestamp}.json"
-                                        st.download_button(
-                                            "Download JSON File",
-                                            json.dumps({"test_cases": result['test_cases']}, indent=2),
-                                            file_name=test_cases_filename,
-                                            mime="application/json"
-                                        )
-                                    
-                                    # Save to session state
-                                    st.session_state.generated_files.append({
+                                    with open(excel_filename, 'wb') as f:
+                                        f.write(excel_data)
+                                    record_generated_files({
                                         'name': excel_filename,
                                         'path': os.path.abspath(excel_filename),
                                         'type': 'test_cases',
                                         'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                                     })
-                                    
-                                    # Show analysis
-                                    if result.get('analysis'):
-                                        st.subheader("📊 Analysis")
-                                        st.json(result['analysis'])
-                                    
-                                else:
-                                    st.error(f"❌ Test generation failed: {result.get('error', 'Unknown error')}")
+                                
                             else:
-                                st.warning("No content found to generate tests for.")
-                    else:
-                        # Code-based test generation
-                        with st.spinner("Generating code-based test cases..."):
-                            # Process uploaded files
-                            all_content = []
-                            file_names = []
+                                st.error(f"❌ Test generation failed: {result.get('error', 'Unknown error')}")
+                        else:
+                            st.warning("No content found to generate tests for.")
+                else:
+                    # Code-based test generation
+                    with st.spinner("Generating code-based test cases..."):
+                        # Process uploaded files
+                        all_content = []
+                        file_names = []
+                        
+                        # Parse requirement documents up front, concurrently
+                        doc_files = [f for f in uploaded_files if _file_ext(f.name) not in CODE_UPLOAD_HANDLERS]
+                        doc_texts = dict(zip((f.file_id for f in doc_files), parse_documents(doc_files)))
+                        
+                        for file in uploaded_files:
+                            handler = CODE_UPLOAD_HANDLERS.get(_file_ext(file.name))
+                            if handler:
+                                blocks = handler(file)
+                            else:
+                                # Requirements document
+                                doc_content = doc_texts.get(file.file_id)
+                                blocks = [(f"# Requirements from: {file.name}\n{doc_content}",
+                                           f"requirements_{file.name}")] if doc_content else []
+                            for block, display_name in blocks:
+                                all_content.append(block)
+                                file_names.append(display_name)
+                        
+                        if all_content:
+                            # Combine all content
+                            combined_content = "\n\n".join(all_content)
                             
-                            for file in uploaded_files:
-                                file_ext = file.name.lower().split('.')[-1]
-                                
-                                if file_ext == 'py':
-                                    # Python file
-                                    content = file.read().decode('utf-8')
-                                    all_content.append(f"# File: {file.name}\n{content}")
-                                    file_names.append(file.name)
-                                    
-                                elif file_ext == 'zip':
-                                    # Project ZIP
-                                    project_dir = extract_project_zip(file)
-                                    if project_dir:
-                                        python_files = list_python_files(project_dir)
-                                        for py_file in python_files:
-                                            try:
-                                                with open(py_file, 'r', encoding='utf-8') as f:
-                                                    content = f.read()
-                                                all_content.append(f"# File: {os.path.basename(py_file)}\n{content}")
-                                                file_names.append(os.path.basename(py_file))
-                                            except UnicodeDecodeError as e:
-                                                st.warning(f"Could not read {py_file} due to encoding issues: {e}")
-                                            except Exception as e:
-                                                st.warning(f"Could not read {py_file}: {e}")
-                                
-                                else:
-                                    # Requirements document
-                                    doc_content = process_uploaded_document(file)
-                                    if doc_content:
-                                        all_content.append(f"# Requirements from: {file.name}\n{doc_content}")
-                                        file_names.append(f"requirements_{file.name}")
+                            # Add custom prompt if provided
+                            if custom_prompt.strip():
+                                combined_content += f"\n\nAdditional Requirements:\n{custom_prompt}"
                             
-                            if all_content:
-                                # Combine all content
-                                combined_content = "\n\n".join(all_content)
-                                
-                                # Add custom prompt if provided
-                                if custom_prompt.strip():
-                                    combined_content += f"\n\nAdditional Requirements:\n{custom_prompt}"
-                                
-                                # Generate tests using Generator with selected model
-                                result = components['generator'].generate_tests(
-                                    code=combined_content,
-                                    language='python',
-                                    test_type='unit',
-                                    model=map_model_name(model)
-                                )
+                            # Generate tests using Generator with selected model
+                            result = components['generator'].generate_tests(
+                                code=combined_content,
+                                language='python',
+                                test_type='unit',
+                                model=map_model_name(model)
+                            )
+                            
+                            if result['success']:
+                                st.success("✅ Tests generated successfully!")
                                 
-                                if result['success']:
-                                    st.success("✅ Tests generated successfully!")
+                                # Handle both old and new response formats
+                                if 'test_code' in result:
+                                    # Old format - single test file
+                                    st.subheader("📋 Generated Test Code")
+                                    st.code(result['test_code'], language='python')
+                                    
+                                    # Download button for single file
+                                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                                    filename = f"test_generated_{timestamp}.py"
+                                    st.download_button(
+                                        label="📥 Download Test File",
+                                        data=result['test_code'],
+                                        file_name=filename,
+                                        mime="text/plain"
+                                    )
+                                elif 'test_files' in result:
+                                    # New format - comprehensive test suite
+                                    st.subheader("📋 Generated Test Suite")
+                                    
+                                    # Show test structure
+                                    if result.get('test_structure'):
+                                        with st.expander("📁 Test Suite Structure"):
+                                            st.json(result['test_structure'])
+                                    
+                                    # Show test files
+                                    if result.get('test_files'):
+                                        st.subheader("📁 Generated Test Files")
+                                        for file_path, full_path in result['test_files'].items():
+                                            if file_path.endswith('.py'):
+                                                st.write(f"• **{file_path}**")
+                                                try:
+                                                    with open(full_path, 'r') as f:
+                                                        file_content = f.read()
+                                                    with st.expander(f"View {file_path}"):
+                                                        st.code(file_content, language='python')
+                                                except Exception as e:
+                                                    st.error(f"Error reading {file_path}: {e}")
+                                            else:
+                                                st.write(f"• {file_path}")
                                     
-                                    # Handle both old and new response formats
-                                    if 'test_code' in result:
-                                        # Old format - single test file
-                                        st.subheader("📋 Generated Test Code")
-                                        st.code(result['test_code'], language='python')
-                                        
-                                        # Download button for single file
+                                    # Download button for test suite
+                                    if result.get('saved_path'):
                                         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                        filename = f"test_generated_{timestamp}.py"
-                                        st.download_button(
-                                            label="📥 Download Test File",
-                                            data=result['test_code'],
-                                            file_name=filename,
-                                            mime="text/plain"
-                                        )
-                                    elif 'test_files' in result:
-                                        # New format - comprehensive test suite
-                                        st.subheader("📋 Generated Test Suite")
-                                        
-                                        # Show test structure
-                                        if result.get('test_structure'):
-                                            with st.expander("📁 Test Suite Structure"):
-                                                st.json(result['test_structure'])
-                                        
-                                        # Show test files
-                                        if result.get('test_files'):
-                                            st.subheader("📁 Generated Test Files")
-                                            for file_path, full_path in result['test_files'].items():
-                                                if file_path.endswith('.py'):
-                                                    st.write(f"• **{file_path}**")
-                                                    try:
-                                                        with open(full_path, 'r') as f:
-                                                            file_content = f.read()
-                                                        with st.expander(f"View {file_path}"):
-                                                            st.code(file_content, language='python')
-                                                    except Exception as e:
-                                                        st.error(f"Error reading {file_path}: {e}")
-                                                else:
-                                                    st.write(f"• {file_path}")
-                                        
-                                        # Download button for test suite
-                                        if result.get('saved_path'):
-                                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                            suite_dir = os.path.dirname(result['saved_path'])
-                                            try:
-                                                import zipfile
-                                                import tempfile
+                                        suite_dir = os.path.dirname(result['saved_path'])
+                                        try:
+                                            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
+                                                with zipfile.ZipFile(tmp_file.name, 'w') as zipf:
+                                                    for root, dirs, files in os.walk(suite_dir):
+                                                        for file in files:
+                                                            file_path = os.path.join(root, file)
+                                                            arcname = os.path.relpath(file_path, suite_dir)
+                                                            zipf.write(file_path, arcname)
+                                                
+                                                with open(tmp_file.name, 'rb', buffering=1 << 20) as f:
+                                                    zip_data = f.read()
                                                 
-                                                with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
-                                                    with zipfile.ZipFile(tmp_file.name, 'w') as zipf:
-                                                        for root, dirs, files in os.walk(suite_dir):
-                                                            for file in files:
-                                                                file_path = os.path.join(root, file)
-                                                                arcname = os.path.relpath(file_path, suite_dir)
-                                                                zipf.write(file_path, arcname)
-                                                    
-                                                    with open(tmp_file.name, 'rb') as f:
-                                                        zip_data = f.read()
-                                                    
-                                                    st.download_button(
-                                                        label="📥 Download Test Suite (ZIP)",
-                                                        data=zip_data,
-                                                        file_name=f"test_suite_{timestamp}.zip",
-                                                        mime="application/zip"
-                                                    )
-                                                    
-                                                    # Clean up temp file
-                                                    os.unlink(tmp_file.name)
-                                            except Exception as e:
-                                                st.error(f"Error creating ZIP: {e}")
+                                                st.download_button(
+                                                    label="📥 Download Test Suite (ZIP)",
+                                                    data=zip_data,
+                                                    file_name=f"test_suite_{timestamp}.zip",
+                                                    mime="application/zip"
+                                                )
+                                                
+                                                # Clean up temp file
+                                                os.unlink(tmp_file.name)
+                                        except Exception as e:
+                                            st.error(f"Error creating ZIP: {e}")
+                                
+                                # File information
+                                st.subheader("📁 Files Processed")
+                                for file_name in file_names:
+                                    st.write(f"• {file_name}")
+                                
+                                # Show analysis
+                                if result.get('analysis'):
+                                    st.subheader("📊 Code Analysis")
                                     
-                                    # File information
-                                    st.subheader("📁 Files Processed")
-                                    for file_name in file_names:
-                                        st.write(f"• {file_name}")
+                                    # Display project information
+                                    analysis = result['analysis']
+                                    col1, col2, col3 = st.columns(3)
+                                    with col1:
+                                        st.metric("Project Type", analysis.get('project_type', 'unknown').replace('_', ' ').title())
+                                    with col2:
+                                        st.metric("Complexity", analysis.get('complexity', 'low').title())
+                                    with col3:
+                                        st.metric("Structure", analysis.get('module_structure', 'standard').replace('_', ' ').title())
+                                    
+                                    # Show detailed analysis
+                                    with st.expander("📋 Detailed Code Analysis"):
+                                        st.json(analysis)
+                                
+                                # Show test results if available
+                                if result.get('run_results'):
+                                    st.subheader("🧪 Test Results")
                                     
-                                    # Show analysis
-                                    if result.get('analysis'):
-                                        st.subheader("📊 Code Analysis")
-                                        
-                                        # Display project information
-                                        analysis = result['analysis']
-                                        col1, col2, col3 = st.columns(3)
-                                        with col1:
-                                            st.metric("Project Type", analysis.get('project_type', 'unknown').replace('_', ' ').title())
-                                        with col2:
-                                            st.metric("Complexity", analysis.get('complexity', 'low').title())
-                                        with col3:
-                                            st.metric("Structure", analysis.get('module_structure', 'standard').replace('_', ' ').title())
-                                        
-                                        # Show detailed analysis
-                                        with st.expander("📋 Detailed Code Analysis"):
-                                            st.json(analysis)
+                                    # Show execution method
+                                    execution_method = result['run_results'].get('execution_method', 'unknown')
+                                    if execution_method == 'docker':
+                                        st.success("🐳 Tests executed in Docker container for isolation")
+                                    elif execution_method == 'local':
+                                        st.info("💻 Tests executed locally")
                                     
-                                    # Show test results if available
-                                    if result.get('run_results'):
-                                        st.subheader("🧪 Test Results")
-                                        
-                                        # Show execution method
-                                        execution_method = result['run_results'].get('execution_method', 'unknown')
-                                        if execution_method == 'docker':
-                                            st.success("🐳 Tests executed in Docker container for isolation")
-                                        elif execution_method == 'local':
-                                            st.info("💻 Tests executed locally")
-                                        
-                                        # Display test metrics
-                                        col1, col2, col3, col4 = st.columns(4)
-                                        with col1:
-                                            st.metric("Tests Run", result['run_results'].get('tests_run', 0))
-                                        with col2:
-                                            st.metric("Tests Passed", result['run_results'].get('tests_passed', 0))
-                                        with col3:
-                                            st.metric("Tests Failed", result['run_results'].get('tests_failed', 0))
-                                        with col4:
-                                            coverage = result['run_results'].get('coverage', 0.0)
-                                            st.metric("Coverage %", f"{coverage:.1f}%")
-                                        
-                                        # Show detailed results
-                                        with st.expander("📋 Detailed Test Results"):
-                                            st.json(result['run_results'])
+                                    # Display test metrics
+                                    col1, col2, col3, col4 = st.columns(4)
+                                    with col1:
+                                        st.metric("Tests Run", result['run_results'].get('tests_run', 0))
+                                    with col2:
+                                        st.metric("Tests Passed", result['run_results'].get('tests_passed', 0))
+                                    with col3:
+                                        st.metric("Tests Failed", result['run_results'].get('tests_failed', 0))
+                                    with col4:
+                                        coverage = result['run_results'].get('coverage', 0.0)
+                                        st.metric("Coverage %", f"{coverage:.1f}%")
                                     
-                                    # Show custom prompt if used
-                                    if custom_prompt.strip():
-                                        st.subheader("📝 Custom Requirements Used")
-                                        st.info(custom_prompt)
+                                    # Show detailed results
+                                    with st.expander("📋 Detailed Test Results"):
+                                        st.json(result['run_results'])
                                 
-                                else:
-                                    st.error(f"❌ Test generation failed: {result.get('error', 'Unknown error')}")
+                                # Show custom prompt if used
+                                if custom_prompt.strip():
+                                    st.subheader("📝 Custom Requirements Used")
+                                    st.info(custom_prompt)
+                            
                             else:
-                                st.warning("No content found to generate tests for.")
-                                
-                except Exception as e:
-                    handle_and_display_error(e, "test_generation")
-        
-        # Tips and guidance - removed to reduce verbosity
+                                st.error(f"❌ Test generation failed: {result.get('error', 'Unknown error')}")
+                        else:
+                            st.warning("No content found to generate tests for.")
+                            
+            except Exception as e:
+                handle_and_display_error(e, "test_generation")
+
+    if test_mode == "Requirements-Based Tests" and st.session_state.requirements_test_result:
+        render_requirements_test_result(st.session_state.requirements_test_result)
+
+    rerun_app_if_files_changed()
     
-    # Tab: Developer (feature development on existing code)
-    with tab_dev:
-        render_tab_hero(
-            "Developer",
-            ["Claude", "Healing", "Docker"],
-            "Ship new features with confidence."
-        )
-        st.header("Developer")
-        st.caption("Implement new features with iterative healing.")
-
-        source_choice = st.radio("Source", ["Upload ZIP/Files", "GitHub URL"], horizontal=True)
-        project_files = {}
-        repo_url = None
-
-        if source_choice == "Upload ZIP/Files":
-            up = st.file_uploader("Upload project ZIP or multiple .py files", type=["zip", "py"], accept_multiple_files=True)
-            if up:
-                for f in up:
-                    if f.name.lower().endswith(".zip"):
-                        proj_dir = extract_project_zip(f)
-                        if proj_dir:
-                            for root, _, files in os.walk(proj_dir):
-                                for name in files:
-                                    path = os.path.join(root, name)
-                                    rel = os.path.relpath(path, proj_dir)
-                                    try:
-                                        with open(path, "r", encoding="utf-8", errors="ignore") as fp:
-                                            project_files[rel] = fp.read()
-                                    except Exception:
-                                        continue
-                    elif f.name.lower().endswith(".py"):
-                        try:
-                            project_files[f.name] = f.read().decode("utf-8", errors="ignore")
-                        except Exception:
-                            pass
-        else:
-            repo_url = st.text_input("GitHub repository URL", placeholder="https://github.com/owner/repo")
-            if repo_url and st.button("Fetch Repo"):
-                try:
-                    import subprocess, shutil
-                    tmpdir = tempfile.mkdtemp(prefix="repo_")
-                    subprocess.run(["git", "clone", "--depth", "1", repo_url, tmpdir], check=True, capture_output=True)
-                    for root, _, files in os.walk(tmpdir):
-                        for name in files:
-                            path = os.path.join(root, name)
-                            rel = os.path.relpath(path, tmpdir)
-                            # Only load text-like files to avoid binary
-                            if any(rel.endswith(ext) for ext in [".py", ".txt", ".md", ".toml", ".cfg", ".ini", ".yaml", ".yml", "requirements.txt", "setup.py", "Pipfile", "pyproject.toml"]):
-                                try:
-                                    with open(path, "r", encoding="utf-8", errors="ignore") as fp:
-                                        project_files[rel] = fp.read()
-                                except Exception:
-                                    continue
-                    shutil.rmtree(tmpdir, ignore_errors=True)
-                    st.success("Repository fetched.")
-                except Exception as e:
-                    handle_and_display_error(e, "github_fetch")
+    # Tips and guidance - removed to reduce verbosity
 
-        feature_prompt = st.text_area("Describe the new feature to implement", height=140, placeholder="Add a new endpoint /reports that returns aggregated analytics, update auth, add tests, and update requirements if needed.")
-        max_attempts = st.slider("Max healing iterations", 1, 7, 5)
-        run_button = st.button("Implement Feature and Run")
 
-        if run_button:
-            if not project_files:
-                st.warning("Please provide code via upload or GitHub.")
-            elif not feature_prompt.strip():
-                st.warning("Please describe the feature to implement.")
-            else:
-                try:
-                    # Determine main file
-                    main_file = detect_main_file(project_files, use_llm=True) or "main.py"
-
-                    # Ask Claude to implement feature by returning updated files
-                    file_blocks = []
-                    for fname, content in project_files.items():
-                        file_blocks.append(f"<<FILENAME:{fname}>>\n{content}\n<<END>>")
-                    files_str = "\n".join(file_blocks)
-                    prompt = f"""
-You are a senior software engineer. Implement the following feature in the provided project. Modify or add files as needed, including tests and requirements.
+# Main application
+def main():
+    # Per-tab hero is rendered inside each tab
+    
+    # Sidebar for configuration
+    with st.sidebar:
+        render_sidebar()
 
-FEATURE REQUEST:
-{feature_prompt}
+    # Main tabs
+    tab1, tab_test_gen, tab_dev, tab_onboard, tab5 = st.tabs([
+        "Code Generation",
+        "Test Generator",
+        "Developer",
+        "On Boarding",
+        "File Manager"
+    ])
+    
 
-PROJECT FILES:
-{files_str}
 
-Return ONLY updated and new files in this exact format, for each file:
-<<FILENAME:path/filename.ext>>
-<file content>
-<<END>>
-"""
-                    claude_resp = generate_with_claude(prompt, model_name="claude-3-5-sonnet-20241022", max_tokens=3500)
+    # Tab 1: Code Generation
+    with tab1:
+        render_code_generation_tab()
 
-                    
-                    pattern = re.compile(r"<<FILENAME:(.*?)>>\n(.*?)<<END>>", re.DOTALL)
-                    updates = {m.group(1).strip(): m.group(2) for m in pattern.finditer(claude_resp)}
-                    if updates:
-                        project_files.update(updates)
+    # Tab 5: File Manager
+    with tab5:
+        render_file_manager_tab()
 
-                    # Run self-healing loop in Docker
-                    result = ai_self_healing_workflow(project_files, code_model="claude-3-5-sonnet-20241022", main_file=main_file, max_attempts=max_attempts)
+    # Tab 6: Test Generator
+    with tab_test_gen:
+        render_test_generator_tab()
 
-                    if result.get("success"):
-                        st.success("Feature implemented and project runs successfully.")
-                    else:
-                        st.warning("Completed iterations but errors remain. Saving latest files anyway.")
-
-                    # Save final files to File Manager and show
-                    for fname, content in result.get("final_files", {}).items():
-                        saved = components['file_manager'].save_project_file(feature_prompt, fname, content)
-                        st.session_state.generated_files.append({
-                            'name': os.path.basename(saved),
-                            'path': saved,
-                            'type': 'code',
-                            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        })
-
-                    st.subheader("Docker Output")
-                    st.code(result.get("output", ""))
-                    if err := result.get("error"):
-                        st.error(err)
-                except Exception as e:
-                    handle_and_display_error(e, "developer_tab")
+    # Tab: Developer (feature development on existing code)
+    # Tab: Developer (feature development on existing code)
+    with tab_dev:
+        render_developer_tab()
 
     # Tab: On Boarding (generate documentation & diagrams)
     with tab_onboard:
-        render_tab_hero(
-            "On Boarding",
-            ["Docs", "Diagrams", "Insights"],
-            "Understand any codebase quickly."
-        )
-        st.header("Onboarding")
-        st.caption("Generate clear docs and flow diagrams.")
-
-        source_choice2 = st.radio("Source", ["Upload ZIP/Files", "GitHub URL"], horizontal=True, key="onboard_src")
-        onboard_files = {}
-        repo_url2 = None
-
-        if source_choice2 == "Upload ZIP/Files":
-            up2 = st.file_uploader("Upload project ZIP or multiple files", type=["zip", "py", "md", "txt"], accept_multiple_files=True, key="onboard_upload")
-            if up2:
-                for f in up2:
-                    if f.name.lower().endswith(".zip"):
-                        proj_dir = extract_project_zip(f)
-                        if proj_dir:
-                            for root, _, files in os.walk(proj_dir):
-                                for name in files:
-                                    path = os.path.join(root, name)
-                                    rel = os.path.relpath(path, proj_dir)
-                                    if any(rel.endswith(ext) for ext in [".py", ".md", ".txt", ".toml", ".yaml", ".yml", "requirements.txt", "setup.py", "Pipfile", "pyproject.toml"]):
-                                        try:
-                                            with open(path, "r", encoding="utf-8", errors="ignore") as fp:
-                                                onboard_files[rel] = fp.read()
-                                        except Exception:
-                                            continue
-                    else:
-                        try:
-                            onboard_files[f.name] = f.read().decode("utf-8", errors="ignore")
-                        except Exception:
-                            pass
-        else:
-            repo_url2 = st.text_input("GitHub repository URL", placeholder="https://github.com/owner/repo", key="onboard_repo")
-            if repo_url2 and st.button("Fetch Repo", key="onboard_fetch"):
-                try:
-                    import subprocess, shutil
-                    tmpdir = tempfile.mkdtemp(prefix="repo_")
-                    subprocess.run(["git", "clone", "--depth", "1", repo_url2, tmpdir], check=True, capture_output=True)
-                    for root, _, files in os.walk(tmpdir):
-                        for name in files:
-                            path = os.path.join(root, name)
-                            rel = os.path.relpath(path, tmpdir)
-                            if any(rel.endswith(ext) for ext in [".py", ".md", ".txt", ".toml", ".yaml", ".yml", "requirements.txt", "setup.py", "Pipfile", "pyproject.toml"]):
-                                try:
-                                    with open(path, "r", encoding="utf-8", errors="ignore") as fp:
-                                        onboard_files[rel] = fp.read()
-                                except Exception:
-                                    continue
-                    shutil.rmtree(tmpdir, ignore_errors=True)
-                    st.success("Repository fetched.")
-                except Exception as e:
-                    handle_and_display_error(e, "onboard_github_fetch")
-
-        doc_prompt_extra = st.text_area("Focus areas (optional)", placeholder="Explain the architecture, modules, data flow, key APIs, setup steps, and how to extend.")
-        gen_doc_btn = st.button("Generate Documentation")
-
-        if gen_doc_btn:
-            if not onboard_files:
-                st.warning("Please provide a project via upload or GitHub.")
-            else:
-                try:
-                    # Build combined context
-                    file_blocks = []
-                    for fname, content in list(onboard_files.items())[:50]:  # limit to 50 files for prompt size
-                        snippet = content if len(content) < 8000 else content[:8000]
-                        file_blocks.append(f"<<FILENAME:{fname}>>\n{snippet}\n<<END>>")
-                    files_str = "\n\n".join(file_blocks)
-
-                    doc_prompt = f"""
-You are a senior developer advocate. Create comprehensive onboarding documentation for the following project with clear sections: Overview, Architecture, Module/Directory Guide, Setup & Run, Development Workflow, Key APIs/Endpoints, Data Flow, Testing, Deployment, and How to Extend. Include concise flow diagrams in Mermaid when useful.
-
-PROJECT FILES (partial):
-{files_str}
-
-EXTRA FOCUS (optional): {doc_prompt_extra}
+        render_onboarding_tab()
 
-Return ONLY Markdown. Include Mermaid diagrams using ```mermaid blocks when appropriate.
-"""
-                    doc_markdown = generate_with_claude(doc_prompt, model_name="claude-3-5-sonnet-20241022", max_tokens=3500)
-
-                    # Save to assessments/docs
-                    filename = f"ONBOARDING_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-                    saved = components['file_manager'].save_project_file("onboarding", filename, doc_markdown)
-                    st.session_state.generated_files.append({
-                        'name': os.path.basename(saved),
-                        'path': saved,
-                        'type': 'assessment',
-                        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
-
-                    st.success("Documentation generated and saved to File Manager.")
-                    st.subheader("Preview")
-                    st.markdown(doc_markdown)
-                except Exception as e:
-                    handle_and_display_error(e, "onboarding_tab")
     # Footer
     # st.markdown("---")
     # st.markdown(
@@ -1925,15 +2476,27 @@ Return ONLY Markdown. Include Mermaid diagrams using ```mermaid blocks when appr
     #     </div>"""
     # )
 
+_WS_RUN_RE = re.compile(r'\s+')
+_FILENAME_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9 _-]')
+
+# st.cache_data rather than functools.lru_cache: app.py is re-executed on every
+# rerun, which would discard a module-level lru_cache each time.
+@st.cache_data(max_entries=256, show_spinner=False)
 def sanitize_for_filename(text: str) -> str:
     """Sanitize text for safe filenames: remove newlines, excessive whitespace, and special characters."""
-    text = re.sub(r'\s+', ' ', text)  # Replace all whitespace (including newlines) with single space
-    text = re.sub(r'[^a-zA-Z0-9 _-]', '', text)  # Remove special characters except space, underscore, hyphen
+    text = _WS_RUN_RE.sub(' ', text)  # Replace all whitespace (including newlines) with single space
+    text = _FILENAME_UNSAFE_RE.sub('', text)  # Remove special characters except space, underscore, hyphen
     return text.strip()[:50]  # Limit length
 
+@st.cache_resource(show_spinner=False)
+def _http_session() -> requests.Session:
+    """Process-wide keep-alive session so repeated LLM calls reuse TCP/TLS connections."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+    return session
+
 # Placeholder for Grok-4 API call
 def generate_with_grok(prompt, api_key=None, model_name="grok-3-latest", temperature=0.7, stream=False):
-    import os
     if api_key is None:
         api_key = os.environ.get("GROK4_API_KEY")
     if not api_key:
@@ -1949,7 +2512,7 @@ def generate_with_grok(prompt, api_key=None, model_name="grok-3-latest", tempera
         "stream": stream,
         "temperature": temperature
     }
-    response = requests.post(url, headers=headers, json=payload)
+    response = _http_session().post(url, headers=headers, json=payload)
     response.raise_for_status()
     data = response.json()
     # Extract the response text from the first choice
@@ -1961,7 +2524,6 @@ if 'Grok-4' in ["Gemini 2.5 Pro", "gpt-4o-mini", "gpt-4o", "Grok-4"] and not os.
 
 # Claude API call function
 def generate_with_claude(prompt, api_key=None, model_name="claude-3-5-sonnet-20241022", temperature=0.7, max_tokens=2048):
-    import os
     if api_key is None:
         api_key = os.environ.get("CLAUDE_API_KEY")
     if not api_key:
@@ -1980,21 +2542,173 @@ def generate_with_claude(prompt, api_key=None, model_name="claude-3-5-sonnet-202
             {"role": "user", "content": prompt}
         ]
     }
-    response = requests.post(url, headers=headers, json=payload)
+    response = _http_session().post(url, headers=headers, json=payload)
     response.raise_for_status()
     data = response.json()
     # Return the content of the first message
     return data["content"][0]["text"] if "content" in data and data["content"] else ""
 
+# Concurrent requests allowed per batch (stays under provider rate limits)
+LLM_BATCH_CONCURRENCY = 5
+
+def generate_with_claude_batch(prompts: list[str], max_tokens: int = 2048, use_cache: bool = False) -> list[str]:
+    """Answer independent prompts concurrently over the shared session, in input order.
+
+    With use_cache each prompt goes through the persistent LLM cache, so repeats cost nothing.
+    """
+    if not prompts:
+        return []
+    with ThreadPoolExecutor(max_workers=min(LLM_BATCH_CONCURRENCY, len(prompts))) as executor:
+        return list(executor.map(
+            lambda prompt: _persistent_llm(prompt, "Claude 3.5 Sonnet", max_tokens=max_tokens, use_cache=use_cache),
+            prompts
+        ))
+
+def _iter_sse_data(response):
+    """Yield the decoded JSON payload of each `data:` line in a server-sent event stream."""
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        yield _json_loads(data)
+
+def generate_with_claude_stream(prompt, api_key=None, model_name="claude-3-5-sonnet-20241022", temperature=0.7, max_tokens=2048):
+    """Yield Claude's reply text as it is generated."""
+    if api_key is None:
+        api_key = os.environ.get("CLAUDE_API_KEY")
+    if not api_key:
+        raise ValueError("Claude API key not found. Please set CLAUDE_API_KEY in your environment or .env file.")
+    headers = {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json"
+    }
+    payload = {
+        "model": model_name,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "stream": True,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+    with _http_session().post("https://api.anthropic.com/v1/messages", headers=headers, json=payload, stream=True) as response:
+        response.raise_for_status()
+        for event in _iter_sse_data(response):
+            if event.get("type") == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield text
+            elif event.get("type") == "error":
+                raise RuntimeError(event.get("error", {}).get("message", "Claude streaming error"))
+
+def generate_with_grok_stream(prompt, api_key=None, model_name="grok-3-latest", temperature=0.7, max_tokens=2048):
+    """Yield Grok's reply text as it is generated (OpenAI-compatible SSE)."""
+    if api_key is None:
+        api_key = os.environ.get("GROK4_API_KEY")
+    if not api_key:
+        raise ValueError("Grok-4 API key not found. Please set GROK4_API_KEY in your environment or .env file.")
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    payload = {
+        "messages": [
+            {"role": "system", "content": "You are a helpful AI assistant."},
+            {"role": "user", "content": prompt}
+        ],
+        "model": model_name,
+        "stream": True,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    with _http_session().post("https://api.x.ai/v1/chat/completions", headers=headers, json=payload, stream=True) as response:
+        response.raise_for_status()
+        for event in _iter_sse_data(response):
+            choices = event.get("choices") or []
+            text = choices[0].get("delta", {}).get("content") if choices else None
+            if text:
+                yield text
+
+# Streaming generator for each UI model that supports it
+LLM_STREAMERS = {
+    "Claude 3.5 Sonnet": generate_with_claude_stream,
+    "Grok-4": generate_with_grok_stream,
+}
+
+def split_complete_blocks(text: str) -> tuple[str, str]:
+    """Split markdown into (complete blocks, unfinished tail).
+
+    A block is complete once a blank line follows it outside any open ``` fence.
+    """
+    cut = pos = 0
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if not line.endswith('\n'):
+            break  # the last line is still being written
+        pos += len(line)
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+        elif not in_fence and not line.strip():
+            cut = pos
+    return text[:cut], text[cut:]
+
+# Minimum seconds between re-renders of the unfinished markdown tail
+STREAM_RENDER_INTERVAL = 0.25
+
+def render_markdown_stream(chunks) -> str:
+    """Render streamed markdown, sending each finished block to the page only once.
+
+    Completed blocks are appended as their own elements; only the short
+    unfinished tail is re-rendered, at most every STREAM_RENDER_INTERVAL.
+    """
+    stable_area = st.container()
+    pending_slot = st.empty()
+    parts = []
+    pending = ""
+    last_render = 0.0
+    for chunk in chunks:
+        parts.append(chunk)
+        stable, pending = split_complete_blocks(pending + chunk)
+        if stable:
+            stable_area.markdown(stable)
+        now = time.monotonic()
+        if stable or now - last_render >= STREAM_RENDER_INTERVAL:
+            pending_slot.markdown(pending)
+            last_render = now
+    pending_slot.markdown(pending)
+    return "".join(parts)
+
+def stream_llm_to_page(prompt, model, max_tokens=2048, temperature=0.7) -> str:
+    """Write an LLM reply to the page as it streams and return the full text.
+
+    Persistent-cache hits (same key as _cached_llm) are rendered at once;
+    streamed replies are stored there when the cache is enabled.
+    """
+    use_persistent_cache = st.session_state.get('use_persistent_cache', False)
+    llm_cache = components['llm_cache']
+    key = llm_cache.make_key(prompt, model, temperature, max_tokens)
+    if use_persistent_cache:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            st.markdown(cached)
+            return cached
+    text = render_markdown_stream(LLM_STREAMERS[model](prompt, temperature=temperature, max_tokens=max_tokens))
+    if use_persistent_cache:
+        llm_cache.set(key, text)
+    return text
+
 # Add a function to orchestrate the workflow
 
-def ai_self_healing_workflow(project_files, code_model, main_file="main.py", test_file="test_main.py", max_attempts=5):
+def ai_self_healing_workflow(project_files, code_model, main_file="main.py", test_file="test_main.py", max_attempts=5, cancel_event=None,
+                             use_cache=False):
     """
     project_files: dict mapping filename to content (e.g., {"main.py": ..., "test_main.py": ..., "README.md": ..., ...})
     1. Generate code with code_model if files are missing
     2. Run in DockerSandbox (run tests if test file is present)
     3. If error or test fail, send ALL files + error to Claude Opus 4, get fix, repeat
     4. Return final working files/output
+    cancel_event: optional threading.Event; when set, stops after the current sandbox run
+    use_cache: serve fix prompts from the persistent LLM cache (off for fresh fixes)
     """
     if main_file not in project_files:
         raise ValueError("main_file must be present in project_files for healing workflow")
@@ -2012,11 +2726,10 @@ def ai_self_healing_workflow(project_files, code_model, main_file="main.py", tes
         history.append({"files": dict(files), "result": result})
         if result["exit_code"] == 0:
             break
-        # Improved prompt for Claude
-        file_blocks = []
-        for fname, content in files.items():
-            file_blocks.append(f"<<FILENAME:{fname}>>\n{content}\n<<END>>")
-        files_str = "\n".join(file_blocks)
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        # Improved prompt for Claude; each call is stateless, so every file goes in full
+        files_str = format_file_blocks(files)
         fix_prompt = f"""
 You are an expert developer and code reviewer. The following project files failed to run or pass all tests. Here are the files and the error message.
 
@@ -2049,23 +2762,27 @@ ERROR:
 
 **Focus on fixing the requirements.txt dependency order first, then any other issues.**
 """
-        claude_response = generate_with_claude(fix_prompt, model_name="claude-3-5-sonnet-20241022")
-        
-        
-        file_pattern = re.compile(r"<<FILENAME:(.*?)>>\n(.*?)<<END>>", re.DOTALL)
-        new_files = {}
-        matches = list(file_pattern.finditer(claude_response))
+        # Runs on the healing worker thread, so only the thread-safe disk cache is used
+        claude_response = _persistent_llm(fix_prompt, "Claude 3.5 Sonnet", use_cache=use_cache)
         
-        for match in matches:
-            fname, content = match.group(1).strip(), match.group(2).strip()
-            new_files[fname] = content
         
-        if new_files:
-            files.update(new_files)
+        new_files = {
+            match.group(1).strip(): match.group(2).strip()
+            for match in _FILE_BLOCK_RE.finditer(claude_response)
+        }
+        # Drop files Claude returned as-is
+        new_files = {fname: content for fname, content in new_files.items() if files.get(fname) != content}
+        if not new_files:
+            # Same files would give the same sandbox result; stop instead of re-running
+            break
+        files.update(new_files)
         attempt += 1
     return {"final_files": files, "history": history, "success": result["exit_code"] == 0, "output": result["stdout"], "error": result["stderr"]}
 
-def detect_main_file(project_files, use_llm=False):
+# Deletes quote and backtick characters via str.translate
+_QUOTE_CHARS = str.maketrans('', '', '"\'`')
+
+def detect_main_file(project_files, use_llm=False, use_cache=False):
     # 1. Prefer main.py
     if "main.py" in project_files:
         return "main.py"
@@ -2083,11 +2800,31 @@ def detect_main_file(project_files, use_llm=False):
     # 5. Use LLM if needed
     if use_llm and len(py_files) > 1:
         prompt = f"""Given the following Python files, which one is the main entry point? List only the filename.\n\n""" + "\n\n".join([f"{fname}:\n{project_files[fname][:500]}" for fname in py_files])
-        main_file = generate_with_claude(prompt, model_name="claude-3-5-sonnet-20241022").strip().split()[0]
+        # One translate pass drops any quoting/backticks around the answer
+        answer = _persistent_llm(prompt, "Claude 3.5 Sonnet", use_cache=use_cache).translate(_QUOTE_CHARS).split()
+        main_file = answer[0] if answer else None
         if main_file in project_files:
             return main_file
     return None
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def _detect_main_file_cached(signature, _project_files, use_llm=False, use_cache=False):
+    """detect_main_file memoized on a project signature (avoids repeat LLM lookups).
+
+    Only signature is hashed by Streamlit; _project_files is passed through.
+    """
+    return detect_main_file(_project_files, use_llm=use_llm, use_cache=use_cache)
+
+def project_signature(project_files: dict) -> str:
+    """Content digest of a {path: text} project, independent of insertion order."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(project_files):
+        digest.update(path.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(project_files[path].encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
 if __name__ == "__main__":
     load_dotenv()
     main() 
\ No newline at end of file
@@ -6,6 +6,7 @@ This module provides the main components for the AI-powered development assistan
 - Generator: Handles code and test generation
 - ErrorHandler: Handles error management and code analysis
 - FileManager: Handles file operations and Docker sandbox
+- LLMCache: Persists LLM responses on disk
 """
 
 try:
@@ -13,12 +14,14 @@ try:
     from .generator import Generator
     from .error_handler import ErrorHandler
     from .file_manager import FileManager
+    from .llm_cache import LLMCache
     
     __all__ = [
         'AIEngine',
         'Generator', 
         'ErrorHandler',
-        'FileManager'
+        'FileManager',
+        'LLMCache'
     ]
     
     # Version information
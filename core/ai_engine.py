@@ -4,16 +4,20 @@ Integrated AI Engine for handling multiple AI models (OpenAI and Gemini).
 
 import os
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 import openai
 import google.generativeai as genai
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import datetime
 import re
+from collections import OrderedDict
 
 load_dotenv()
 
+# Number of (model, prompt) responses kept in memory per engine
+RESPONSE_MEMO_SIZE = 32
+
 class AIEngine:
     """Handles AI model interactions for code generation and analysis."""
     
@@ -24,6 +28,7 @@ class AIEngine:
         self.fallback_model = os.getenv('FALLBACK_MODEL', 'gemini-pro')
         self.max_tokens = int(os.getenv('MAX_TOKENS', 4000))
         self.temperature = float(os.getenv('TEMPERATURE', 0.7))
+        self._response_memo = OrderedDict()
         
         self._setup_models()
     
@@ -81,26 +86,81 @@ class AIEngine:
             logging.info(f"Available AI models: {', '.join(available_models)}")
     
     def generate_response(self, prompt: str, model: str = None) -> str:
-        """Generate response using available AI models."""
+        """Generate response using available AI models, reusing recent identical requests."""
+        key = (model, prompt)
+        if key in self._response_memo:
+            self._response_memo.move_to_end(key)
+            return self._response_memo[key]
+        response = self._generate_response(prompt, model)
+        # Error strings are returned, not raised, so keep them out of the memo
+        if not response.startswith("Error generating response:"):
+            self._remember(key, response)
+        return response
+    
+    def stream_response(self, prompt: str, model: str = None) -> Iterator[str]:
+        """Yield response text as it arrives. Raises on provider errors.
+        
+        Only responses consumed to the end are memoized, so a caller that stops
+        early never leaves a truncated answer behind.
+        """
+        key = (model, prompt)
+        if key in self._response_memo:
+            self._response_memo.move_to_end(key)
+            yield self._response_memo[key]
+            return
+        backend, model_name = self._route(model)
+        chunks = []
+        if backend == 'openai':
+            stream = self.openai_client.chat.completions.create(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": "You are a helpful AI assistant."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                stream=True
+            )
+            pieces = (event.choices[0].delta.content for event in stream if event.choices)
+        else:
+            pieces = (event.text for event in self.gemini_model.generate_content(prompt, stream=True))
+        for piece in pieces:
+            if piece:
+                chunks.append(piece)
+                yield piece
+        self._remember(key, ''.join(chunks))
+    
+    def _remember(self, key, response: str):
+        """Store a response in the bounded memo, evicting the least recently used."""
+        self._response_memo[key] = response
+        if len(self._response_memo) > RESPONSE_MEMO_SIZE:
+            self._response_memo.popitem(last=False)
+    
+    def _route(self, model: str = None):
+        """Return (backend, model_name) for the requested model or the default one."""
+        if model:
+            lowered = model.lower()
+            if model.startswith('gpt') and self.openai_client:
+                return 'openai', model
+            elif 'gemini' in lowered and self.gemini_model:
+                return 'gemini', None
+            elif ('claude' in lowered or 'grok' in lowered) and self.openai_client:
+                return 'openai', model
+        
+        # Fall back to default model selection
+        if self.default_model.startswith('gpt') and self.openai_client:
+            return 'openai', self.default_model
+        elif self.gemini_model:
+            return 'gemini', None
+        raise Exception("No AI models available")
+    
+    def _generate_response(self, prompt: str, model: str = None) -> str:
+        """Dispatch a prompt to the requested model or the default one."""
         try:
-            # Use the specified model or fall back to default
-            if model:
-                if model.startswith('gpt') and self.openai_client:
-                    return self._generate_with_openai(prompt, model)
-                elif 'gemini' in model.lower() and self.gemini_model:
-                    return self._generate_with_gemini(prompt)
-                elif 'claude' in model.lower() and self.openai_client:
-                    return self._generate_with_openai(prompt, model)
-                elif 'grok' in model.lower() and self.openai_client:
-                    return self._generate_with_openai(prompt, model)
-            
-            # Fall back to default model selection
-            if self.default_model.startswith('gpt') and self.openai_client:
-                return self._generate_with_openai(prompt, self.default_model)
-            elif self.gemini_model:
-                return self._generate_with_gemini(prompt)
-            else:
-                raise Exception("No AI models available")
+            backend, model_name = self._route(model)
+            if backend == 'openai':
+                return self._generate_with_openai(prompt, model_name)
+            return self._generate_with_gemini(prompt)
         except Exception as e:
             logging.error(f"Error generating response: {e}")
             return f"Error generating response: {e}"
@@ -3,6 +3,7 @@ File Manager utility for handling file operations.
 """
 
 import os
+import io
 import json
 import zipfile
 from datetime import datetime
@@ -15,12 +16,24 @@ import shutil
 import uuid
 import shlex
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+_WS_RUN_RE = re.compile(r'\s+')
+_FILENAME_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_. -]')
+
+# Top-level module of each import/from statement, indented or not
+_IMPORT_NAME_RE = re.compile(r'^\s*(?:import|from)\s+(\w+)', re.MULTILINE)
+
+# Standard library modules never written to an auto-detected requirements.txt
+_STDLIB_IMPORTS = frozenset({'os', 'sys', 'json', 'datetime', 'logging', 'pathlib', 'typing', 're',
+                             'subprocess', 'tempfile', 'shutil', 'uuid', 'hashlib'})
+_GUI_IMPORTS = frozenset({'tkinter', 'tk', 'gui', 'wx', 'pygame', 'matplotlib'})
 
 def sanitize_for_filename(text: str) -> str:
     """Sanitize text for safe filenames: remove newlines, excessive whitespace, and special characters."""
     text = text.replace('/', '_').replace('\\', '_')  # Flatten any directory structure
-    text = re.sub(r'\s+', ' ', text)  # Replace all whitespace (including newlines) with single space
-    text = re.sub(r'[^a-zA-Z0-9_. -]', '', text)  # Allow dot for extensions
+    text = _WS_RUN_RE.sub(' ', text)  # Replace all whitespace (including newlines) with single space
+    text = _FILENAME_UNSAFE_RE.sub('', text)  # Allow dot for extensions
     return text.strip()[:100]
 
 class FileManager:
@@ -81,13 +94,9 @@ class FileManager:
         except Exception:
             return "Unknown"
     
-    def create_zip_archive(self, file_list: List[Dict[str, Any]]) -> str:
-        """Create a ZIP archive of all generated files."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        zip_filename = f"generated_files_{timestamp}.zip"
-        zip_path = self.base_dir / zip_filename
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    def _write_zip(self, target, file_list: List[Dict[str, Any]]):
+        """Write the files in file_list to target (a path or binary file object) as a ZIP."""
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for file_info in file_list:
                 if os.path.exists(file_info['path']):
                     # Preserve the full relative path under the code directory
@@ -95,9 +104,24 @@ class FileManager:
                         rel_path = os.path.relpath(file_info['path'], self.code_dir)
                     except ValueError:
                         rel_path = os.path.basename(file_info['path'])
-                    zipf.write(file_info['path'], rel_path)
-        
+                    # Feed deflate 1 MiB blocks instead of reading whole files
+                    with open(file_info['path'], 'rb', buffering=1 << 20) as src, \
+                            zipf.open(rel_path, 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+
+    def create_zip_archive(self, file_list: List[Dict[str, Any]]) -> str:
+        """Create a ZIP archive of all generated files."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        zip_filename = f"generated_files_{timestamp}.zip"
+        zip_path = self.base_dir / zip_filename
+        self._write_zip(zip_path, file_list)
         return str(zip_path)
+
+    def create_zip_bytes(self, file_list: List[Dict[str, Any]]) -> bytes:
+        """Build a ZIP archive of the given files in memory, without touching disk."""
+        buffer = io.BytesIO()
+        self._write_zip(buffer, file_list)
+        return buffer.getvalue()
     
     def cleanup_old_files(self, days_old: int = 7):
         """Clean up files older than specified days."""
@@ -142,9 +166,7 @@ class FileManager:
         else:
             return 'other' 
 
-    def save_project_file(self, requirement: str, filename: str, content: str) -> str:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        sanitized_req = sanitize_for_filename(requirement)
+    def _project_file_path(self, timestamp: str, sanitized_req: str, filename: str) -> Path:
         sanitized_filename = sanitize_for_filename(filename)
         # Determine the correct directory based on file type
         if sanitized_filename.endswith(('.py', '.js', '.java', '.cpp', '.c', '.go', '.rs')):
@@ -153,12 +175,26 @@ class FileManager:
             directory = self.test_dir
         else:
             directory = self.code_dir
-        full_filename = f"{timestamp}_{sanitized_req}_{sanitized_filename}"
-        file_path = directory / full_filename
+        return directory / f"{timestamp}_{sanitized_req}_{sanitized_filename}"
+
+    def save_project_file(self, requirement: str, filename: str, content: str) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = self._project_file_path(timestamp, sanitize_for_filename(requirement), filename)
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(content)
         return str(file_path) 
 
+    def save_project_files(self, requirement: str, files: Dict[str, str]) -> List[str]:
+        """Save several project files as one batch; returns the paths in input order."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        sanitized_req = sanitize_for_filename(requirement)
+        targets = [(self._project_file_path(timestamp, sanitized_req, filename), content)
+                   for filename, content in files.items()]
+        # Overlap the writes instead of issuing them one by one
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda target: target[0].write_text(target[1], encoding='utf-8'), targets))
+        return [str(file_path) for file_path, _ in targets]
+
     def save_project_structure_file(self, requirement: str, project_structure: Dict[str, Any]) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         sanitized_req = sanitize_for_filename(requirement)
@@ -285,24 +321,12 @@ class DockerSandbox:
                     
                     for filename, content in files.items():
                         if filename.endswith('.py') and isinstance(content, str):
-                            # Look for common import patterns
-                            import_patterns = [
-                                r'^import\s+(\w+)',
-                                r'^from\s+(\w+)',
-                                r'^\s*import\s+(\w+)',
-                                r'^\s*from\s+(\w+)'
-                            ]
-                            for pattern in import_patterns:
-                                import re
-                                matches = re.findall(pattern, content, re.MULTILINE)
-                                for match in matches:
-                                    # Filter out standard library modules
-                                    if match not in ['os', 'sys', 'json', 'datetime', 'logging', 'pathlib', 'typing', 're', 'subprocess', 'tempfile', 'shutil', 'uuid', 'hashlib']:
-                                        detected_deps.add(match)
-                                    
-                                    # Check for GUI dependencies
-                                    if match in ['tkinter', 'tk', 'gui', 'wx', 'pygame', 'matplotlib']:
-                                        gui_dependencies.add(match)
+                            # One precompiled pass finds import and from statements at any indent
+                            modules = set(_IMPORT_NAME_RE.findall(content))
+                            # Filter out standard library modules
+                            detected_deps |= modules - _STDLIB_IMPORTS
+                            # Check for GUI dependencies
+                            gui_dependencies |= modules & _GUI_IMPORTS
                     
                     if detected_deps:
 
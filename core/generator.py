@@ -7,12 +7,90 @@ import logging
 import subprocess
 import re
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 from pathlib import Path
 import black
 import ast
 from datetime import datetime
 
+# Patterns used on every generated test/result; compiled once at import time
+_CAMEL_BOUNDARY_RE = re.compile(r'([a-z0-9])([A-Z])')
+_CLASS_NAME_RE = re.compile(r'class\s+(\w+)')
+_DEF_NAME_RE = re.compile(r'def\s+(\w+)')
+_BLANK_LINES_RE = re.compile(r'\n\n\n+')
+_COVERAGE_TOTAL_RE = re.compile(r'TOTAL\s+\d+\s+\d+\s+(\d+)%')
+_PERCENT_RE = re.compile(r'(\d+)%')
+_MISSING_MODULE_RE = re.compile(r"No module named '([^']+)'")
+_NON_ALNUM_SPACE_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+# Leading tag of a requirements response line (the old startswith checks, in one match)
+_REQUIREMENT_TAG_RE = re.compile(r'(TEST_CASE_|SUBCATEGORY_|CATEGORY_|PRIORITY_)')
+
+# "## <header>" prefixes in a test suite response and the section each opens
+_SUITE_HEADERS = (
+    ('## TEST_PLAN.md', 'test_plan'),
+    ('## tests/conftest.py', 'tests/conftest.py'),
+    ('## pytest.ini', 'pytest_config'),
+    ('## requirements-dev.txt', 'requirements_dev'),
+)
+_SUITE_META_SECTIONS = frozenset({'test_plan', 'pytest_config', 'requirements_dev'})
+
+def _suite_section_for(header: str) -> Optional[str]:
+    """Return the section a "##" header opens, or None for headers that only close one."""
+    for prefix, section in _SUITE_HEADERS:
+        if header.startswith(prefix):
+            return section
+    if header.startswith('## tests/test_'):
+        # Test file sections are keyed by their path
+        return header.replace('## ', '').strip()
+    return None
+
+# Per-test-case tags in a requirements response and the field each sets
+_REQUIREMENT_FIELDS = {
+    'CATEGORY_': 'category',
+    'SUBCATEGORY_': 'subcategory',
+    'PRIORITY_': 'priority',
+}
+
+# Built once at import; filled per request with str.format
+_REQUIREMENTS_TEST_PROMPT = """
+You are a senior Android mobile device testing engineer. Generate exactly {test_count} test cases for the following device specifications/requirements.
+
+Device Specifications/Requirements:
+{requirements}
+
+IMPORTANT: Format each test case exactly as follows:
+
+TEST_CASE_1: [Detailed test case description]
+CATEGORY_1: [Category]
+SUBCATEGORY_1: [Subcategory]
+PRIORITY_1: [High/Medium/Low/Critical]
+
+TEST_CASE_2: [Detailed test case description]
+CATEGORY_2: [Category]
+SUBCATEGORY_2: [Subcategory]
+PRIORITY_2: [High/Medium/Low/Critical]
+
+Continue this pattern for all {test_count} test cases.
+
+Test case descriptions should be:
+- Action-oriented (start with verbs like "Execute", "Perform", "Navigate", "Test", "Verify", "Launch", "Connect", "Capture", "Check")
+- Specific to the device specifications provided
+- Detailed enough for an AI agent to execute
+- Focused on practical testing scenarios
+
+Available categories: Connectivity, UI/UX, Compatibility, Hardware, Security, Software, Audio, Performance, Usability, Battery, Camera, Storage, Network, Biometrics, System, Functional, Non-Functional, Integration
+
+Test case descriptions should be action-oriented and specific, for example:
+- "Execute tap gesture on Settings app icon and verify app launches successfully"
+- "Perform swipe up gesture from bottom edge to access recent apps menu"
+- "Navigate to Settings > Display > Brightness and adjust slider to 50%"
+- "Test WiFi connection stability during phone calls"
+- "Verify camera app opens and captures photo within 3 seconds"
+
+Do not include any introductory text or explanations. Start directly with TEST_CASE_1: and continue with the exact format above.
+"""
+
 class Generator:
     """Handles both code and test generation, formatting, and validation."""
     
@@ -134,7 +212,8 @@ class Generator:
                 "error": str(e)
             }
     
-    def generate_requirements_tests(self, requirements: str, test_count: int = 100, model: str = None) -> Dict[str, Any]:
+    def generate_requirements_tests(self, requirements: str, test_count: int = 100, model: str = None,
+                                    on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
         """
         Generate test cases from requirements specifications.
         
@@ -142,6 +221,7 @@ class Generator:
             requirements: Requirements text/specifications
             test_count: Number of test cases to generate
             model: AI model to use for generation
+            on_progress: Optional callback receiving (test cases seen, test_count) while streaming
             
         Returns:
             Dict containing test cases in structured format
@@ -154,7 +234,7 @@ class Generator:
             prompt = self._create_requirements_test_prompt(requirements, test_count)
             
             # Generate test cases using AI with specified model
-            response = self.ai_engine.generate_response(prompt, model=model)
+            response = self._stream_requirements_response(prompt, test_count, model, on_progress)
             
             # Check if response is an error message
             if response.startswith("Error generating response:"):
@@ -386,44 +466,33 @@ if __name__ == "__main__":
     
     def _create_requirements_test_prompt(self, requirements: str, test_count: int) -> str:
         """Create prompt for requirements-based test generation."""
-        return f"""
-You are a senior Android mobile device testing engineer. Generate exactly {test_count} test cases for the following device specifications/requirements.
-
-Device Specifications/Requirements:
-{requirements}
-
-IMPORTANT: Format each test case exactly as follows:
-
-TEST_CASE_1: [Detailed test case description]
-CATEGORY_1: [Category]
-SUBCATEGORY_1: [Subcategory]
-PRIORITY_1: [High/Medium/Low/Critical]
-
-TEST_CASE_2: [Detailed test case description]
-CATEGORY_2: [Category]
-SUBCATEGORY_2: [Subcategory]
-PRIORITY_2: [High/Medium/Low/Critical]
-
-Continue this pattern for all {test_count} test cases.
-
-Test case descriptions should be:
-- Action-oriented (start with verbs like "Execute", "Perform", "Navigate", "Test", "Verify", "Launch", "Connect", "Capture", "Check")
-- Specific to the device specifications provided
-- Detailed enough for an AI agent to execute
-- Focused on practical testing scenarios
-
-Available categories: Connectivity, UI/UX, Compatibility, Hardware, Security, Software, Audio, Performance, Usability, Battery, Camera, Storage, Network, Biometrics, System, Functional, Non-Functional, Integration
-
-Test case descriptions should be action-oriented and specific, for example:
-- "Execute tap gesture on Settings app icon and verify app launches successfully"
-- "Perform swipe up gesture from bottom edge to access recent apps menu"
-- "Navigate to Settings > Display > Brightness and adjust slider to 50%"
-- "Test WiFi connection stability during phone calls"
-- "Verify camera app opens and captures photo within 3 seconds"
-
-Do not include any introductory text or explanations. Start directly with TEST_CASE_1: and continue with the exact format above.
-"""
+        return _REQUIREMENTS_TEST_PROMPT.format(requirements=requirements, test_count=test_count)
 
+    def _stream_requirements_response(self, prompt: str, test_count: int, model: str = None,
+                                      on_progress: Optional[Callable[[int, int], None]] = None) -> str:
+        """Collect a streamed requirements response, stopping once a header past test_count arrives."""
+        if not hasattr(self.ai_engine, 'stream_response'):
+            return self.ai_engine.generate_response(prompt, model=model)
+        marker = 'TEST_CASE_'
+        parts = []
+        carry = ''
+        headers = 0
+        try:
+            for piece in self.ai_engine.stream_response(prompt, model=model):
+                parts.append(piece)
+                # Keep a short tail so a header split across chunks is still counted once
+                window = carry + piece
+                headers += window.count(marker)
+                carry = window[-(len(marker) - 1):]
+                if on_progress:
+                    on_progress(min(headers, test_count), test_count)
+                if headers > test_count:
+                    break
+        except Exception as e:
+            logging.error(f"Error generating response: {e}")
+            return f"Error generating response: {e}"
+        return ''.join(parts)
+    
     def _parse_requirements_response(self, response: str, expected_count: int) -> List[Dict[str, Any]]:
         """Parse the structured response from requirements-based test generation."""
         test_cases = []
@@ -436,49 +505,44 @@ Do not include any introductory text or explanations. Start directly with TEST_C
             if not line:
                 continue
                 
-            # Parse structured format
-            if line.startswith('TEST_CASE_'):
+            # "TAG_<n>: value" (colon optional) -> dispatch on the leading TAG_
+            match = _REQUIREMENT_TAG_RE.match(line)
+            if not match:
+                continue
+            tag = match.group(1)
+            _, sep, rest = line.partition(':')
+            value = rest.strip() if sep else line
+            
+            if tag == 'TEST_CASE_':
                 # Save previous test case if exists
                 if current_test and 'description' in current_test:
                     test_cases.append(current_test)
                     test_case_count += 1
                 
+                # Anything past the requested count would be truncated anyway
+                if test_case_count >= expected_count:
+                    current_test = {}
+                    break
+                
                 # Start new test case
                 current_test = {
                     'test_id': f"TC_{test_case_count+1:04d}",
-                    'description': line.split(':', 1)[1].strip() if ':' in line else line,
+                    'description': value,
                     'category': 'Hardware',  # Default
                     'subcategory': 'General',  # Default
                     'device_type': 'Mobile Device',
                     'priority': 'Medium'  # Default
                 }
                 
-            elif line.startswith('CATEGORY_'):
-                if current_test:
-                    category = line.split(':', 1)[1].strip() if ':' in line else line
-                    current_test['category'] = category
-                    
-            elif line.startswith('SUBCATEGORY_'):
-                if current_test:
-                    subcategory = line.split(':', 1)[1].strip() if ':' in line else line
-                    current_test['subcategory'] = subcategory
-                    
-            elif line.startswith('PRIORITY_'):
-                if current_test:
-                    priority = line.split(':', 1)[1].strip() if ':' in line else line
-                    current_test['priority'] = priority
+            elif current_test and tag in _REQUIREMENT_FIELDS:
+                current_test[_REQUIREMENT_FIELDS[tag]] = value
         
         # Add the last test case
         if current_test and 'description' in current_test:
             test_cases.append(current_test)
-            test_case_count += 1
         
-        # Add test_id to all test cases if missing
-        for i, test_case in enumerate(test_cases):
-            if 'test_id' not in test_case:
-                test_case['test_id'] = f"TC_{i+1:04d}"
-        
-        return test_cases[:expected_count]
+        # The loop stops at expected_count, and every case gets its test_id on creation
+        return test_cases
     
     def _create_python_test_template(self, code: str, code_analysis: Dict[str, Any], test_type: str) -> str:
         """Create Python test template."""
@@ -719,76 +783,30 @@ pytest-mock>=3.10.0
         }
         
         try:
-            # Parse the response to extract different components
-            lines = response.split('\n')
+            # Single pass: every "##" header closes the open section and picks the next one
             current_section = None
             current_content = []
             
-            for line in lines:
+            def flush():
+                if current_section and current_content:
+                    if current_section in _SUITE_META_SECTIONS:
+                        test_structure[current_section] = '\n'.join(current_content)
+                    else:
+                        test_structure["test_files"][current_section] = '\n'.join(current_content)
+            
+            for line in response.split('\n'):
                 line = line.strip()
                 if not line:
                     continue
-                    
-                if line.startswith('## TEST_PLAN.md'):
-                    if current_section and current_content:
-                        if current_section in ["test_plan", "pytest_config", "requirements_dev"]:
-                            test_structure[current_section] = '\n'.join(current_content)
-                        else:
-                            test_structure["test_files"][current_section] = '\n'.join(current_content)
-                    current_section = "test_plan"
-                    current_content = []
-                elif line.startswith('## tests/conftest.py'):
-                    if current_section and current_content:
-                        if current_section in ["test_plan", "pytest_config", "requirements_dev"]:
-                            test_structure[current_section] = '\n'.join(current_content)
-                        else:
-                            test_structure["test_files"][current_section] = '\n'.join(current_content)
-                    current_section = "tests/conftest.py"
-                    current_content = []
-                elif line.startswith('## tests/test_'):
-                    if current_section and current_content:
-                        if current_section in ["test_plan", "pytest_config", "requirements_dev"]:
-                            test_structure[current_section] = '\n'.join(current_content)
-                        else:
-                            test_structure["test_files"][current_section] = '\n'.join(current_content)
-                    # Extract filename from the header
-                    filename = line.replace('## ', '').strip()
-                    current_section = filename
-                    current_content = []
-                elif line.startswith('## pytest.ini'):
-                    if current_section and current_content:
-                        if current_section in ["test_plan", "pytest_config", "requirements_dev"]:
-                            test_structure[current_section] = '\n'.join(current_content)
-                        else:
-                            test_structure["test_files"][current_section] = '\n'.join(current_content)
-                    current_section = "pytest_config"
-                    current_content = []
-                elif line.startswith('## requirements-dev.txt'):
-                    if current_section and current_content:
-                        if current_section in ["test_plan", "pytest_config", "requirements_dev"]:
-                            test_structure[current_section] = '\n'.join(current_content)
-                        else:
-                            test_structure["test_files"][current_section] = '\n'.join(current_content)
-                    current_section = "requirements_dev"
-                    current_content = []
-                elif line.startswith('##'):
-                    # End of current section
-                    if current_section and current_content:
-                        if current_section in ["test_plan", "pytest_config", "requirements_dev"]:
-                            test_structure[current_section] = '\n'.join(current_content)
-                        else:
-                            test_structure["test_files"][current_section] = '\n'.join(current_content)
-                    current_section = None
+                if line.startswith('##'):
+                    flush()
+                    current_section = _suite_section_for(line)
                     current_content = []
                 elif current_section:
                     current_content.append(line)
             
             # Add the last section
-            if current_section and current_content:
-                if current_section in ["test_plan", "pytest_config", "requirements_dev"]:
-                    test_structure[current_section] = '\n'.join(current_content)
-                else:
-                    test_structure["test_files"][current_section] = '\n'.join(current_content)
+            flush()
             
             # Validate that we have the required test structure
             if not test_structure["test_files"]:
@@ -818,14 +836,8 @@ pytest-mock>=3.10.0
         for line in lines:
             stripped_line = line.strip()
             
-            # Skip problematic import statements for the detected module
-            if module_name and any(pattern in line for pattern in [
-                f'from {module_name} import',
-                f'import {module_name}',
-                f'from {module_name} import',
-                f'import {module_name} as',
-                module_name
-            ]):
+            # Skip any line referencing the detected module (covers its import forms)
+            if module_name and module_name in line:
                 continue
             
             # Skip external library imports (keep only standard library and pytest)
@@ -839,17 +851,8 @@ pytest-mock>=3.10.0
                 
             cleaned_lines.append(line)
         
-        # Join and clean up
-        cleaned_content = '\n'.join(cleaned_lines)
-        
-        # Remove any remaining problematic patterns with regex
-        if module_name:
-            cleaned_content = re.sub(rf'from\s+{re.escape(module_name)}\s+import.*?\n', '', cleaned_content)
-            cleaned_content = re.sub(rf'import\s+{re.escape(module_name)}.*?\n', '', cleaned_content)
-            cleaned_content = re.sub(rf'{re.escape(module_name)}.*?\n', '', cleaned_content)
-        
         # Fix indentation issues - ensure proper function structure
-        lines = cleaned_content.split('\n')
+        lines = cleaned_lines
         fixed_lines = []
         current_indent = 0
         
@@ -891,7 +894,7 @@ pytest-mock>=3.10.0
         
         # Join and final cleanup
         cleaned_content = '\n'.join(fixed_lines)
-        cleaned_content = re.sub(r'\n\n\n+', '\n\n', cleaned_content)
+        cleaned_content = _BLANK_LINES_RE.sub('\n\n', cleaned_content)
         
         return cleaned_content.strip()
     
@@ -907,7 +910,7 @@ pytest-mock>=3.10.0
                 # Use the first class name as a base for module name
                 class_name = classes[0]
                 # Convert CamelCase to snake_case for module name
-                module_name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', class_name).lower()
+                module_name = _CAMEL_BOUNDARY_RE.sub(r'\1_\2', class_name).lower()
                 return module_name
             
             # Look for function definitions
@@ -916,7 +919,7 @@ pytest-mock>=3.10.0
                 # Use the first function name as a base
                 func_name = functions[0]
                 # Convert to snake_case
-                module_name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', func_name).lower()
+                module_name = _CAMEL_BOUNDARY_RE.sub(r'\1_\2', func_name).lower()
                 return module_name
             
             # If no classes or functions, try to extract from file content
@@ -924,17 +927,17 @@ pytest-mock>=3.10.0
             for line in lines:
                 # Look for common patterns that might indicate module name
                 if 'class ' in line:
-                    match = re.search(r'class\s+(\w+)', line)
+                    match = _CLASS_NAME_RE.search(line)
                     if match:
                         class_name = match.group(1)
-                        module_name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', class_name).lower()
+                        module_name = _CAMEL_BOUNDARY_RE.sub(r'\1_\2', class_name).lower()
                         return module_name
                 
                 if 'def ' in line:
-                    match = re.search(r'def\s+(\w+)', line)
+                    match = _DEF_NAME_RE.search(line)
                     if match:
                         func_name = match.group(1)
-                        module_name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', func_name).lower()
+                        module_name = _CAMEL_BOUNDARY_RE.sub(r'\1_\2', func_name).lower()
                         return module_name
             
             # Default fallback
@@ -1329,7 +1332,7 @@ def mock_environment():
                 results["tests_failed"] = len(failed_lines)
                 
                 # Extract coverage
-                coverage_match = re.search(r'TOTAL\s+\d+\s+\d+\s+(\d+)%', run_result.stdout)
+                coverage_match = _COVERAGE_TOTAL_RE.search(run_result.stdout)
                 if coverage_match:
                     results["coverage"] = float(coverage_match.group(1))
             
@@ -1430,7 +1433,7 @@ def mock_environment():
                 results["tests_failed"] = len(failed_lines)
                 
                 # Extract coverage
-                coverage_match = re.search(r'TOTAL\s+\d+\s+\d+\s+(\d+)%', process.stdout)
+                coverage_match = _COVERAGE_TOTAL_RE.search(process.stdout)
                 if coverage_match:
                     results["coverage"] = float(coverage_match.group(1))
             
@@ -1624,7 +1627,7 @@ services:
                     if "TOTAL" in process.stdout and "%" in process.stdout:
                         try:
                             coverage_line = [line for line in process.stdout.split('\n') if "TOTAL" in line and "%" in line][0]
-                            coverage_match = re.search(r'(\d+)%', coverage_line)
+                            coverage_match = _PERCENT_RE.search(coverage_line)
                             if coverage_match:
                                 results["coverage"] = float(coverage_match.group(1))
                         except (IndexError, ValueError):
@@ -1634,7 +1637,7 @@ services:
                     if results["tests_run"] == 0:
                         # Check for specific import errors
                         if "ModuleNotFoundError" in process.stderr:
-                            missing_module = re.search(r"No module named '([^']+)'", process.stderr)
+                            missing_module = _MISSING_MODULE_RE.search(process.stderr)
                             if missing_module:
                                 module_name = missing_module.group(1)
                                 results["error"] = f"Test execution failed: Missing module '{module_name}'. The generated tests require dependencies that aren't available. This is expected for code with external dependencies."
@@ -1694,6 +1697,6 @@ services:
     def _sanitize_filename(self, requirement: str) -> str:
         """Sanitize requirement text for filename."""
         # Remove special characters and replace spaces with underscores
-        sanitized = re.sub(r'[^a-zA-Z0-9\s]', '', requirement)
-        sanitized = re.sub(r'\s+', '_', sanitized)
+        sanitized = _NON_ALNUM_SPACE_RE.sub('', requirement)
+        sanitized = _WHITESPACE_RE.sub('_', sanitized)
         return sanitized[:50]  # Limit length
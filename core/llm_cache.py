@@ -0,0 +1,69 @@
+"""
+Persistent LLM response cache backed by SQLite.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+# Same location the app uses, so the cache is shared regardless of working directory
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".codegen_tester", "cache", "llm.sqlite")
+
+
+class LLMCache:
+    """Stores LLM responses on disk so identical requests survive process restarts."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            # WAL lets concurrent app processes read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v BLOB, ts INTEGER)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build a content-addressed key from the request parameters."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
+        return row[0].decode("utf-8") if row else None
+
+    def set(self, key: str, value: str):
+        """Store value under key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (k, v, ts) VALUES (?, ?, ?)",
+                (key, value.encode("utf-8"), int(time.time())),
+            )
+            self._conn.commit()
+
+    def prune(self, max_age: float) -> int:
+        """Delete entries older than max_age seconds; return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM kv WHERE ts < ?", (int(time.time() - max_age),))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def get_or_set(self, key: str, fn: Callable[[], str]) -> str:
+        """Return the cached value for key, computing and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = fn()
+            self.set(key, value)
+        return value